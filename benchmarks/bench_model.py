@@ -0,0 +1,282 @@
+# encoding: utf-8
+
+"""
+    Benchmarks of froshki model construction & validation.
+
+    Usage:
+        python benchmarks/bench_model.py [--quick] [--json results.json]
+                                         [--compare baseline.json] [--filter NAME]
+
+    Results saved with --json can be compared against in later runs with
+    --compare, to catch performance regressions between releases.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import froshki
+from froshki import Froshki, Attribute, validation_hook
+
+
+SCHEMA_SIZES = (5, 50, 500)
+INHERITANCE_DEPTHS = (1, 4, 16)
+MIXIN_COUNTS = (1, 4, 16)
+
+
+class IntAttribute(Attribute):
+    @classmethod
+    def transform(klass, input_value):
+        return int(input_value)
+    @classmethod
+    def validate(klass, input_value):
+        if input_value >= 0:
+            return True, input_value
+        else:
+            return False, 'negative value'
+
+
+def attr_names(size):
+    return ['attr_{0}'.format(index) for index in range(size)]
+
+
+def make_model(size, aliased=False, name='Model', base=Froshki, **options):
+    namespace = dict(options)
+    for attr_name in attr_names(size):
+        key_alias = 'key_' + attr_name if aliased else None
+        namespace[attr_name] = IntAttribute(key_alias=key_alias)
+    return type(name, (base,), namespace)
+
+
+def make_deep_model(depth, size_per_class=5):
+    model = Froshki
+    for level in range(depth):
+        namespace = dict(
+            ('attr_{0}_{1}'.format(level, index), IntAttribute())
+            for index in range(size_per_class)
+        )
+        model = type('Level{0}'.format(level), (model,), namespace)
+    return model
+
+
+def make_mixin_model(mixin_count, size_per_class=5):
+    mixins = []
+    for mixin_index in range(mixin_count):
+        namespace = dict(
+            ('attr_{0}_{1}'.format(mixin_index, index), IntAttribute())
+            for index in range(size_per_class)
+        )
+        mixins.append(type('Mixin{0}'.format(mixin_index), (object,), namespace))
+    return type('Mixed', (Froshki,) + tuple(mixins), {})
+
+
+def source_for(model, invalid=False):
+    names = model.get_schema().attr_names
+    value = '-1' if invalid else '1'
+    return dict((name, value) for name in names)
+
+
+def bench_cases(quick=False):
+    """Yield (name, callable to time) pairs."""
+    sizes = SCHEMA_SIZES[:2] if quick else SCHEMA_SIZES
+
+    for size in sizes:
+        model = make_model(size)
+        source = source_for(model)
+        invalid_source = source_for(model, invalid=True)
+
+        yield 'init/attrs={0}'.format(size), (
+            lambda model=model, source=source: model(source=source)
+        )
+
+        def validate_clean(model=model, source=source):
+            model(source=source).validate()
+        yield 'validate_clean/attrs={0}'.format(size), validate_clean
+
+        def validate_invalid(model=model, source=invalid_source):
+            model(source=source).validate()
+        yield 'validate_invalid/attrs={0}'.format(size), validate_invalid
+
+        instance = model(source=source)
+        def validate_reset(instance=instance, source=source):
+            instance.reset(source=source).validate()
+        yield 'validate_reset/attrs={0}'.format(size), validate_reset
+
+        patch_source = dict(list(source.items())[:3])
+        partial_model = model.partial()
+        def validate_partial(model=partial_model, source=patch_source):
+            model(source=source).validate()
+        yield 'validate_partial/attrs={0}/given=3'.format(size), validate_partial
+
+        generated = make_model(size, generate_methods=True)
+        def validate_generated(model=generated, source=source):
+            model(source=source).validate()
+        yield 'validate_generated/attrs={0}'.format(size), validate_generated
+
+        aliased = make_model(size, aliased=True)
+        alias_source = dict(
+            ('key_' + name, value) for name, value in source.items()
+        )
+        def validate_aliased(model=aliased, source=alias_source):
+            model(source=source).validate()
+        yield 'validate_aliased/attrs={0}'.format(size), validate_aliased
+
+        extra_source = dict(source)
+        extra_source.update(
+            ('unknown_{0}'.format(index), index) for index in range(size * 20)
+        )
+        def init_ignoring_unknown(model=model, source=extra_source):
+            model(source=source, ignore_unknown_keys=True)
+        yield 'init_ignore_unknown/attrs={0}/extra={1}'.format(
+            size, size * 20), init_ignoring_unknown
+
+        validated = model(source=source)
+        validated.validate()
+        yield 'json_dumps_data/attrs={0}'.format(size), (
+            lambda froshki=validated: json.dumps(froshki.data)
+        )
+        yield 'dumps/attrs={0}'.format(size), (
+            lambda froshki=validated: froshki.dumps()
+        )
+
+        rows = [source] * 100
+        yield 'validate_many/attrs={0}/rows=100'.format(size), (
+            lambda model=model, rows=rows: model.validate_many(rows)
+        )
+
+    for depth in INHERITANCE_DEPTHS:
+        model = make_deep_model(depth)
+        source = source_for(model)
+        def validate_deep(model=model, source=source):
+            model(source=source).validate()
+        yield 'validate_inherited/depth={0}'.format(depth), validate_deep
+
+    for mixin_count in MIXIN_COUNTS:
+        model = make_mixin_model(mixin_count)
+        source = source_for(model)
+        def validate_mixed(model=model, source=source):
+            model(source=source).validate()
+        yield 'validate_mixins/mixins={0}'.format(mixin_count), validate_mixed
+
+    class Hooked(make_model(5)):
+        @validation_hook.extend(error='ordered')
+        def ordered(self):
+            return self.attr_0 <= self.attr_1
+    source = source_for(Hooked)
+    def validate_hooked(model=Hooked, source=source):
+        model(source=source).validate()
+    yield 'validate_hooks/attrs=5', validate_hooked
+
+    for case in ext_bench_cases(sizes):
+        yield case
+
+
+def ext_bench_cases(sizes):
+    try:
+        import trafaret
+        from froshki.ext.trafaret_attr import trafaret_attr
+    except ImportError:
+        trafaret = None
+    try:
+        import voluptuous
+        from froshki.ext.voluptuous_attr import voluptuous_attr
+    except ImportError:
+        voluptuous = None
+
+    for size in sizes[:2]:
+        if trafaret is not None:
+            TrafaretInt = trafaret_attr(trafaret.Int(gte=0))
+            model = type('TrafaretModel', (Froshki,), dict(
+                (name, TrafaretInt()) for name in attr_names(size)
+            ))
+            source = dict((name, 1) for name in attr_names(size))
+            def validate_trafaret(model=model, source=source):
+                model(source=source).validate()
+            yield 'validate_trafaret/attrs={0}'.format(size), validate_trafaret
+            bulk_model = type('TrafaretBulkModel', (model,), dict(
+                bulk_validation=True,
+            ))
+            def validate_trafaret_bulk(model=bulk_model, source=source):
+                model(source=source).validate()
+            yield 'validate_trafaret_bulk/attrs={0}'.format(size), (
+                validate_trafaret_bulk
+            )
+        if voluptuous is not None:
+            VoluptuousInt = voluptuous_attr(
+                voluptuous.Schema(voluptuous.All(int, voluptuous.Range(min=0)))
+            )
+            model = type('VoluptuousModel', (Froshki,), dict(
+                (name, VoluptuousInt()) for name in attr_names(size)
+            ))
+            source = dict((name, 1) for name in attr_names(size))
+            def validate_voluptuous(model=model, source=source):
+                model(source=source).validate()
+            yield 'validate_voluptuous/attrs={0}'.format(size), validate_voluptuous
+            bulk_model = type('VoluptuousBulkModel', (model,), dict(
+                bulk_validation=True,
+            ))
+            def validate_voluptuous_bulk(model=bulk_model, source=source):
+                model(source=source).validate()
+            yield 'validate_voluptuous_bulk/attrs={0}'.format(size), (
+                validate_voluptuous_bulk
+            )
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """Best time per call in seconds, looping for at least `min_time` per run."""
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='skip largest schemas and shorten runs')
+    parser.add_argument('--json', metavar='PATH',
+                        help='save results as JSON')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare with results saved by --json')
+    parser.add_argument('--filter', metavar='NAME', default='',
+                        help='run cases containing NAME only')
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    min_time = 0.05 if args.quick else 0.2
+    results = {}
+    for name, func in bench_cases(quick=args.quick):
+        if args.filter not in name:
+            continue
+        func()  # Warm up, also compiling schemas.
+        seconds = measure(func, min_time=min_time)
+        results[name] = seconds
+        line = '{0:<48} {1:>12.2f} us'.format(name, seconds * 1e6)
+        if name in baseline:
+            line += '  {0:>6.2f}x'.format(seconds / baseline[name])
+        print(line)
+
+    if args.json:
+        with open(args.json, 'w') as result_file:
+            json.dump(dict(
+                froshki=froshki.__version__,
+                python=platform.python_version(),
+                implementation=platform.python_implementation(),
+                results=results,
+            ), result_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# encoding: utf-8
+
+"""
+    Multi-threaded stress benchmark of froshki model construction & validation.
+
+    Usage:
+        python benchmarks/bench_threads.py [--threads 1,2,4,8]
+                                           [--instances N] [--attrs N]
+
+    Each thread constructs & validates instances of shared models, starting
+    with a model class not yet compiled. Reports throughput by thread count,
+    and fails if any validation result differs from the single-threaded one.
+    Throughput scales with threads on free-threaded CPython builds only,
+    the GIL serializes pure Python work otherwise.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from froshki import validation_hook
+from bench_model import make_model, source_for
+
+timer = getattr(time, 'perf_counter', time.time)
+
+
+def make_hooked_model(size):
+
+    class Hooked(make_model(size)):
+        @validation_hook.extend(error='ordered', depends=('attr_0', 'attr_1'))
+        def ordered(self):
+            return self.attr_0 <= self.attr_1
+
+    return Hooked
+
+
+def run(threads, instances, size):
+    """Construct & validate `instances` per thread -> instances per second."""
+    model = make_hooked_model(size)  # Compiled by the threads concurrently.
+    sources = [source_for(model), source_for(model, invalid=True)]
+    # No threading.Barrier on Python 2, release all the workers at once.
+    ready = threading.Event()
+    failures = []
+
+    def work():
+        ready.wait()
+        for index in range(instances):
+            source = sources[index % 2]
+            froshki = model(source=source)
+            if froshki.validate() != (index % 2 == 0):
+                failures.append(index)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    start = timer()
+    ready.set()
+    for worker in workers:
+        worker.join()
+    seconds = timer() - start
+    if failures:
+        raise AssertionError('inconsistent validations: {0}'.format(failures[:10]))
+    return threads * instances / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', default='1,2,4,8',
+                        help='comma separated thread counts')
+    parser.add_argument('--instances', type=int, default=20000,
+                        help='instances per thread')
+    parser.add_argument('--attrs', type=int, default=20,
+                        help='attributes per model')
+    args = parser.parse_args(argv)
+
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('GIL enabled: {0}'.format(gil_enabled))
+    baseline = None
+    for threads in [int(count) for count in args.threads.split(',')]:
+        throughput = run(threads, args.instances, args.attrs)
+        if baseline is None:
+            baseline = throughput
+        print('threads={0:<4} {1:>12.0f} instances/s  {2:>6.2f}x'.format(
+            threads, throughput, throughput / baseline,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,9 @@
     :license: BSD, see LICENSE for more details.
 """
 
-from .model import Froshki, validation_hook, Attribute
+from .model import (
+    Froshki, CompactFroshki, validation_hook, Attribute, ModelAttribute, ListOf,
+    FroshkiMeta,
+)
 
-__version__ = '0.4.3'
+__version__ = '0.5.0'
@@ -0,0 +1,142 @@
+# encoding: utf-8
+
+"""
+    froshki.aio
+    ~~~~~~~~~~~
+
+    Implements asynchronous validation of Froshki objects,
+    accepting coroutine attribute methods and validation hooks.
+    Requires Python 3.5 or later.
+
+    :copyright: (c) 2013 by ymat<drowse314@gmail.com>.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import asyncio
+import inspect
+from .model import Attribute, _partial_plan
+
+
+async def _resolve(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def validate_attribute(attr_obj, input_value):
+    """
+    Asynchronous counterpart of Attribute._validate -> (is_valid, value_or_message).
+
+    Attribute.transform and Attribute.validate may be coroutine functions,
+    in which case `cache_size` is rejected on schema compilation.
+    """
+    if (attr_obj._validate.__func__ is not Attribute._validate.__func__
+            or attr_obj.cache_size):
+        # Respect customized or cached per-value validation.
+        return await _resolve(attr_obj._validate(input_value))
+    try:
+        value_to_store = await _resolve(attr_obj.transform(input_value))
+    except Exception:
+        return False, 'data conversion error: {}'.format(input_value)
+    return await _resolve(attr_obj.validate(value_to_store))
+
+
+async def validate_async(froshki, concurrency=None, only=None):
+    """
+    validate_async(froshki) -> boolean, as Froshki.validate does.
+
+    Attributes to validate are checked concurrently, then validation hooks.
+    Synchronous and coroutine methods can be mixed.
+    `concurrency` limits the number of checks running at once.
+    `only` and `Froshki.partial_validation` are handled as Froshki.validate does.
+    Usage:
+    >>> import asyncio
+    >>> from froshki import Froshki, Attribute, validation_hook
+    >>> taken = set(['drowse314'])
+    >>> class Register(Froshki):
+    ...     user_id = Attribute()
+    ...     @validation_hook.extend(error='user id is taken')
+    ...     async def unique_user_id(self):
+    ...         await asyncio.sleep(0)
+    ...         return self.user_id not in taken
+    >>>
+    >>> register = Register(user_id='ymat')
+    >>> asyncio.run(register.avalidate())
+    True
+    >>> register = Register(user_id='drowse314')
+    >>> asyncio.run(register.avalidate())
+    False
+    >>> register.errors
+    {'unique_user_id': 'user id is taken'}
+    """
+    schema = froshki._schema
+    if concurrency is not None:
+        semaphore = asyncio.Semaphore(concurrency)
+    else:
+        semaphore = None
+
+    async def limited(awaitable):
+        if semaphore is None:
+            return await awaitable
+        async with semaphore:
+            return await awaitable
+
+    async def check_attribute(attr_name):
+        attr_data = froshki._get_attr_data(attr_name)
+        if attr_data is None and attr_name in schema.nullable_attrs:
+            return True, attr_data
+        return await validate_attribute(
+            schema.attributes[attr_name], attr_data,
+        )
+
+    async def check_hook(validator_name):
+        validator = schema.hooks[validator_name]
+        return await _resolve(validator.validate(validator_name, froshki))
+
+    partial = only is not None or froshki.partial_validation
+    if partial:
+        # As Froshki._validate_partially, settling partial models.
+        settle = only is None
+        if settle:
+            only = froshki._supplied_attrs()
+        plan_attrs, plan_hooks = _partial_plan(schema, only)
+        attr_names = froshki._pending_attrs(plan_attrs)
+        if settle:
+            froshki._clear_yet_to_validate()
+        else:
+            froshki._discard_yet_to_validate(attr_names)
+    else:
+        attr_names = list(froshki._attrs_to_validate())
+    is_valid = True
+    attr_results = await asyncio.gather(*[
+        limited(check_attribute(attr_name)) for attr_name in attr_names
+    ])
+    for attr_name, (attr_is_valid, value_to_store) in zip(
+            attr_names, attr_results):
+        froshki._set_attr_validation_data(
+            attr_name, attr_is_valid, value_to_store
+        )
+        is_valid &= attr_is_valid
+    if partial:
+        errors = froshki._errors
+        is_valid = not (errors and any(name in errors for name in plan_attrs))
+        hooks_to_validate = froshki._stale_hooks(plan_hooks, attr_names)
+        hook_results = froshki._hook_results or {}
+        for validator_name in plan_hooks:
+            if validator_name not in hooks_to_validate:
+                is_valid &= hook_results[validator_name]
+    else:
+        is_valid &= froshki._kept_errors_validity()
+        is_valid &= froshki._reused_hooks_validity(attr_names)
+        hooks_to_validate = froshki._hooks_to_validate(attr_names)
+    hook_results = await asyncio.gather(*[
+        limited(check_hook(validator_name))
+        for validator_name in hooks_to_validate
+    ])
+    for validator_name, hook_is_valid in zip(
+            hooks_to_validate, hook_results):
+        froshki._set_hook_validation_data(validator_name, hook_is_valid)
+        is_valid &= hook_is_valid
+    if not partial:
+        froshki._clear_yet_to_validate()
+    return is_valid
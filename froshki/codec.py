@@ -0,0 +1,180 @@
+# encoding: utf-8
+
+"""
+    froshki.codec
+    ~~~~~~~~~~~~~
+
+    Implements serialization of Froshki objects into JSON or msgpack,
+    following the compiled schemas of their classes.
+
+    :copyright: (c) 2013 by ymat<drowse314@gmail.com>.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import json
+import operator
+from .model import Attribute
+
+
+class EncodingPlan(object):
+    """
+    Output keys, attribute names and encoders of a schema, in declaration order.
+    """
+
+    def __init__(self, schema, by_alias=False):
+        base_encode = Attribute.encode.__func__
+        self.names = schema.attr_names
+        self.keys = []
+        self.encoders = {}
+        for name in schema.attr_names:
+            attr_obj = schema.attributes[name]
+            if by_alias and attr_obj.key_alias is not None:
+                self.keys.append(attr_obj.key_alias)
+            else:
+                self.keys.append(name)
+            if attr_obj.encode.__func__ is not base_encode:
+                self.encoders[name] = attr_obj.encode
+        self.keys = tuple(self.keys)
+        # Output as stored, when keys are in declaration order.
+        self.is_identity = self.keys == self.names and not self.encoders
+        self.key_map = dict(zip(self.names, self.keys))
+        if len(self.names) == 1:
+            name = self.names[0]
+            self.getter = lambda values: (values[name],)
+        elif self.names:
+            self.getter = operator.itemgetter(*self.names)
+        else:
+            self.getter = lambda values: ()
+
+    def encode(self, values):
+        """Encode attribute values from a mapping -> dict."""
+        try:
+            # All attributes set, get values at once.
+            record = dict(zip(self.keys, self.getter(values)))
+        except KeyError:
+            record = dict(
+                (self.key_map[name], values[name])
+                for name in self.names if name in values
+            )
+        encoders = self.encoders
+        if encoders:
+            key_map = self.key_map
+            for name in encoders:
+                key = key_map[name]
+                if key in record:
+                    record[key] = encoders[name](record[key])
+        return record
+
+
+def encoding_plan(schema, by_alias=False):
+    """encoding_plan(schema) -> EncodingPlan, built once per schema & option."""
+    plan = schema.encoding_plans.get(by_alias)
+    if plan is None:
+        plan = schema.encoding_plans[by_alias] = EncodingPlan(schema, by_alias)
+    return plan
+
+
+def to_primitive(froshki, by_alias=False):
+    """
+    to_primitive(froshki) -> dict of encoded attribute values.
+
+    Reads values from the instance storage without copying it,
+    skipping attributes never set.
+    """
+    plan = encoding_plan(froshki._schema, by_alias)
+    return plan.encode(froshki._attr_values())
+
+
+def _record(froshki, by_alias):
+    """to_primitive, returning the storage itself when possible."""
+    plan = encoding_plan(froshki._schema, by_alias)
+    values = froshki._attr_values()
+    if (plan.is_identity and type(values) is dict
+            and tuple(values) == plan.names):
+        return values
+    return plan.encode(values)
+
+
+def _serialize(obj, format):
+    if format == 'json':
+        return json.dumps(obj)
+    elif format == 'msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError('msgpack is not installed')
+        return msgpack.packb(obj)
+    raise ValueError('unknown format: {0}'.format(format))
+
+
+def dumps(froshki, by_alias=False, format='json'):
+    """
+    dumps(froshki) -> serialized attribute values.
+
+    Usage:
+    >>> from froshki import Froshki, Attribute
+    >>> class ResourceId(Attribute):
+    ...     @classmethod
+    ...     def transform(klass, input_value):
+    ...         return int(input_value)
+    >>> class Download(Froshki):
+    ...     resource_id = ResourceId(key_alias='id')
+    ...     filetype = Attribute()
+    >>>
+    >>> download = Download(id='9', filetype='pdf')
+    >>> download.validate()
+    True
+    >>> dumps(download, by_alias=True)
+    '{"id": 9, "filetype": "pdf"}'
+    """
+    return _serialize(_record(froshki, by_alias), format)
+
+
+def dump_many(instances, by_alias=False, format='json'):
+    """dump_many(instances) -> serialized list of attribute values."""
+    return _serialize(
+        [_record(froshki, by_alias) for froshki in instances], format,
+    )
+
+
+def source_from_json(raw):
+    """source_from_json(raw) -> decoded JSON object, as attribute source."""
+    obj = json.loads(raw)
+    if not isinstance(obj, dict):
+        raise ValueError('expected a JSON object')
+    return obj
+
+
+def from_json(model, raw, ignore_unknown_keys=None):
+    """
+    from_json(model, raw) -> model instance.
+
+    Usage:
+    >>> from froshki import Froshki, Attribute
+    >>> class Download(Froshki):
+    ...     resource_id = Attribute()
+    ...     filetype = Attribute()
+    >>>
+    >>> download = from_json(
+    ...     Download,
+    ...     b'{"resource_id": "9", "filetype": "pdf", "meta": {"tags": []}}',
+    ...     ignore_unknown_keys=True,
+    ... )
+    >>> download.filetype
+    'pdf'
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    # Froshki.__init__ looks up known keys only, if fewer.
+    return model(
+        source=source_from_json(raw),
+        ignore_unknown_keys=ignore_unknown_keys,
+    )
+
+
+def iter_json_lines(model, lines, ignore_unknown_keys=None):
+    """iter_json_lines(model, lines) -> generator of model instances."""
+    for line in lines:
+        if not line.strip():
+            continue
+        yield from_json(model, line, ignore_unknown_keys=ignore_unknown_keys)
@@ -0,0 +1,200 @@
+# encoding: utf-8
+
+"""
+    froshki.codegen
+    ~~~~~~~~~~~~~~~
+
+    Generates specialized __init__ & validate methods for Froshki subclasses,
+    used when `Froshki.generate_methods` option is set.
+
+    :copyright: (c) 2013 by ymat<drowse314@gmail.com>.
+    :license: BSD, see LICENSE for more details.
+"""
+
+
+INIT_TEMPLATE = '''\
+def __init__(self, source=None, ignore_unknown_keys=None,
+             **init_attrs_by_kws):
+    self._data = data = {{}}
+    if ignore_unknown_keys is not None:
+        self.ignore_unknown_keys = ignore_unknown_keys
+    else:
+        ignore_unknown_keys = self.ignore_unknown_keys
+    default_values = self.__class__.default_values
+    for key in default_values:
+        name = key_map.get(key)
+        if name is None:
+            raise_unknown(self, key)
+        data[name] = default_values[key]
+    if source is not None:
+        for key in source_keys(key_map, source, ignore_unknown_keys):
+            name = key_map.get(key)
+            if name is not None:
+                data[name] = source[key]
+            elif not ignore_unknown_keys:
+                raise_unknown(self, key)
+    for key in init_attrs_by_kws:
+        name = key_map.get(key)
+        if name is None:
+            raise_unknown(self, key)
+        data[name] = init_attrs_by_kws[key]
+    self._yet_to_validate = {attr_names}
+    self._errors = {{}}
+'''
+
+VALIDATE_TEMPLATE = '''\
+def validate(self):
+    data = self._data
+    errors = self._errors
+    yet_to_validate = self._yet_to_validate
+{revalidation}    is_valid = True
+{attr_blocks}{kept_errors}{hook_blocks}    yet_to_validate.clear()
+    return is_valid
+'''
+
+REVALIDATION_TEMPLATE = '''\
+    if errors:
+        yet_to_validate.update(
+            name for name in errors if name in attributes
+        )
+'''
+
+KEPT_ERRORS_TEMPLATE = '''\
+    is_valid &= self._kept_errors_validity()
+'''
+
+ATTR_TEMPLATE = '''\
+    if {name!r} in yet_to_validate:
+        value = data.get({name!r})
+{check}        if attr_is_valid:
+            errors.pop({name!r}, None)
+            data[{name!r}] = value
+        else:
+            errors[{name!r}] = value
+        is_valid &= attr_is_valid
+'''
+
+NULLABLE_CHECK = '''\
+        if value is None:
+            attr_is_valid = True
+        else:
+{check}'''
+
+INLINED_CHECK = '''\
+        try:
+            transformed = transform_{index}(value)
+        except:
+            attr_is_valid, value = False, conversion_error.format(value)
+        else:
+            attr_is_valid, value = validate_{index}(transformed)
+'''
+
+CALL_CHECK = '''\
+        attr_is_valid, value = validate_attr_{index}(value)
+'''
+
+HOOK_TEMPLATE = '''\
+    errors.pop({name!r}, None)
+    hook_is_valid = hook_{index}.validate({name!r}, self)
+    if not hook_is_valid and hook_{index}.error is not None:
+        errors[{name!r}] = hook_{index}.error
+    is_valid &= hook_is_valid
+'''
+
+# Hooks with dependencies reuse their last results.
+DEPENDENT_HOOKS_TEMPLATE = '''\
+    is_valid &= self._validate_hooks(yet_to_validate)
+'''
+
+
+def _indent(source, level=1):
+    return ''.join(
+        '    ' * level + line if line.strip() else line
+        for line in source.splitlines(True)
+    )
+
+
+def _raise_unknown(froshki, name):
+    raise TypeError(
+        "'{klass}' has no attirbute {attr}".format(
+            klass=froshki.__class__.__name__,
+            attr=name,
+        )
+    )
+
+
+def _compile_function(source, func_name, namespace, klass):
+    filename = '<froshki generated {0}.{1}>'.format(
+        klass.__name__, func_name,
+    )
+    code = compile(source, filename, 'exec')
+    exec(code, namespace)
+    function = namespace[func_name]
+    function.__source__ = source
+    return function
+
+
+def generate_init(schema):
+    """
+    generate_init(schema) -> __init__ function for the schema's model.
+
+    Sources attributes through the key map of names & aliases,
+    without per-key method calls.
+    """
+    source = INIT_TEMPLATE.format(
+        attr_names='set({0!r})'.format(schema.attr_names),
+    )
+    from .model import _source_keys
+    namespace = dict(
+        key_map=schema.key_map,
+        source_keys=_source_keys,
+        raise_unknown=_raise_unknown,
+    )
+    return _compile_function(source, '__init__', namespace, schema.model)
+
+
+def generate_validate(schema, attribute_class, revalidate_errors=True):
+    """
+    generate_validate(schema, attribute_class) -> validate function.
+
+    Unrolls per-attribute validations and validation hooks in straight-line code.
+    Attribute.transform/validate calls are inlined unless
+    `attribute_class._validate` is overridden or validation is cached.
+    """
+    base_validate = attribute_class.__dict__['_validate'].__func__
+    namespace = dict(
+        attributes=schema.attributes,
+        conversion_error='data conversion error: {}',
+    )
+    attr_blocks = []
+    for index, name in enumerate(schema.attr_names):
+        attr_obj = schema.attributes[name]
+        if (attr_obj._validate.__func__ is base_validate
+                and not attr_obj.cache_size):
+            check = INLINED_CHECK.format(index=index)
+            namespace['transform_{0}'.format(index)] = attr_obj.transform
+            namespace['validate_{0}'.format(index)] = attr_obj.validate
+        else:
+            check = CALL_CHECK.format(index=index)
+            namespace['validate_attr_{0}'.format(index)] = attr_obj._validate
+        if name in schema.nullable_attrs:
+            check = NULLABLE_CHECK.format(check=_indent(check))
+        attr_blocks.append(
+            ATTR_TEMPLATE.format(name=name, check=check)
+        )
+    hook_blocks = []
+    if schema.hook_dependencies:
+        hook_blocks.append(DEPENDENT_HOOKS_TEMPLATE)
+    else:
+        for index, name in enumerate(schema.extra_validators):
+            namespace['hook_{0}'.format(index)] = schema.hooks[name]
+            hook_blocks.append(
+                HOOK_TEMPLATE.format(name=name, index=index)
+            )
+    source = VALIDATE_TEMPLATE.format(
+        revalidation=REVALIDATION_TEMPLATE if revalidate_errors else '',
+        kept_errors='' if revalidate_errors else KEPT_ERRORS_TEMPLATE,
+        attr_blocks=''.join(attr_blocks),
+        hook_blocks=''.join(hook_blocks),
+    )
+    return _compile_function(source, 'validate', namespace, schema.model)
@@ -0,0 +1,62 @@
+# encoding: utf-8
+
+"""
+    froshki.ext
+    ~~~~~~~~~~~
+
+    froshki.Attribute extensions with data validation libraries,
+    and helpers shared by them.
+
+    :copyright: (c) 2013 by ymat<drowse314@gmail.com>.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import functools
+from froshki import Attribute
+
+
+def compile_check_loop(attr_class, attributes, get_check, error_type,
+                       get_error):
+    """
+    compile_check_loop(attr_class, attributes,
+                       get_check, error_type, get_error)
+        -> bulk_validator or None.
+
+    Implements Attribute.compile_bulk_validator for `attr_class`, whose
+    validate(input_value) calls a library check raising `error_type`.
+    get_check(attribute) -> check(input_value) -> value_to_store,
+    get_error(error) -> error message.
+    None unless transformation or validation of all attributes
+    is left as in `attr_class` and not cached.
+    """
+    for attr_obj in attributes.values():
+        klass = type(attr_obj)
+        if (klass.transform.__func__ is not Attribute.transform.__func__
+                or klass.validate.__func__ is not attr_class.validate.__func__
+                or klass._validate.__func__ is not Attribute._validate.__func__
+                or klass.cache_size):
+            return None
+    checks = tuple(
+        (name, get_check(attr_obj)) for name, attr_obj in attributes.items()
+    )
+    nullable_names = frozenset(
+        name for name, attr_obj in attributes.items() if attr_obj.nullable
+    )
+    return functools.partial(
+        _run_check_loop, checks, nullable_names, error_type, get_error,
+    )
+
+
+def _run_check_loop(checks, nullable_names, error_type, get_error, data):
+    values_to_store = {}
+    error_messages = {}
+    for name, check in checks:
+        input_value = data[name]
+        if input_value is None and name in nullable_names:
+            values_to_store[name] = None
+            continue
+        try:
+            values_to_store[name] = check(input_value)
+        except error_type as err:
+            error_messages[name] = get_error(err)
+    return values_to_store, error_messages
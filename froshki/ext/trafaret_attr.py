@@ -11,11 +11,13 @@
     :license: BSD, see LICENSE for more details.
 """
 
+from operator import attrgetter
 try:
     import trafaret
 except ImportError:
     raise ImportError('trafaret is not installed')
 from froshki import Attribute
+from froshki.ext import compile_check_loop
 
 
 class TrafaretPoweredAttribute(Attribute):
@@ -37,12 +39,114 @@ class TrafaretPoweredAttribute(Attribute):
         except trafaret.DataError as err:
             return False, err.error
 
+    @classmethod
+    def compile_bulk_validator(klass, attributes):
+        """Build a validator running trafaret checks in one loop."""
+        return compile_check_loop(
+            TrafaretPoweredAttribute, attributes,
+            attrgetter('trafaret.check'), trafaret.DataError,
+            attrgetter('error'),
+        )
+
+    @classmethod
+    def json_schema(klass):
+        return trafaret_json_schema(klass.trafaret)
+
+
+def _trafaret_classes(*names):
+    # Trafaret classes available in the installed version.
+    classes = (getattr(trafaret, name, None) for name in names)
+    return tuple(klass for klass in classes if isinstance(klass, type))
+
+
+_STRING_FORMATS = {'<Email>': 'email', '<URL>': 'uri'}
+
+
+def trafaret_json_schema(checker):
+    """
+    trafaret_json_schema(checker) -> JSON Schema dict.
+
+    Maps a trafaret to JSON Schema constraints where possible,
+    never rejecting inputs the trafaret accepts
+    (numbers are accepted as strings as trafaret does).
+    Unknown or converting trafarets accept anything.
+    >>> trafaret_json_schema(trafaret.String(max_length=8))
+    {'type': 'string', 'minLength': 1, 'maxLength': 8}
+    """
+    representation = getattr(checker, 'representation', None)
+    if representation in _STRING_FORMATS:
+        return {'type': 'string', 'format': _STRING_FORMATS[representation]}
+    if isinstance(checker, _trafaret_classes('WithRepr')):
+        return trafaret_json_schema(checker.trafaret)
+    if isinstance(checker, _trafaret_classes('Or')):
+        alternatives = [
+            trafaret_json_schema(alternative)
+            for alternative in checker.trafarets
+        ]
+        if not all(alternatives):
+            return {}
+        return {'anyOf': alternatives}
+    if isinstance(checker, _trafaret_classes('And')):
+        # The other trafaret checks converted values, not inputs.
+        return trafaret_json_schema(checker.trafaret)
+    if isinstance(checker, _trafaret_classes('Bool')):
+        return {'type': 'boolean'}
+    if isinstance(checker, _trafaret_classes('Null')):
+        return {'type': 'null'}
+    if isinstance(checker, _trafaret_classes('Int', 'Float')):
+        if isinstance(checker, _trafaret_classes('Int')):
+            number_type = 'integer'
+        else:
+            number_type = 'number'
+        fragment = {'type': [number_type, 'string', 'boolean']}
+        # Bounds only apply to numbers in JSON Schema.
+        for option, keyword in (('gte', 'minimum'), ('lte', 'maximum'),
+                                ('gt', 'exclusiveMinimum'),
+                                ('lt', 'exclusiveMaximum')):
+            bound = getattr(checker, option, None)
+            if bound is not None:
+                fragment[keyword] = bound
+        return fragment
+    if isinstance(checker, _trafaret_classes('Bytes')):
+        return {}
+    if isinstance(checker, _trafaret_classes('String')):
+        fragment = {'type': 'string'}
+        min_length = getattr(checker, 'min_length', None)
+        if min_length:
+            fragment['minLength'] = min_length
+        elif not getattr(checker, 'allow_blank', True):
+            fragment['minLength'] = 1
+        max_length = getattr(checker, 'max_length', None)
+        if max_length is not None:
+            fragment['maxLength'] = max_length
+        return fragment
+    if isinstance(checker, _trafaret_classes('RegexpRaw')):
+        return {'type': 'string', 'pattern': checker.raw_regexp}
+    if isinstance(checker, _trafaret_classes('Enum')):
+        return {'enum': list(checker.variants)}
+    if isinstance(checker, _trafaret_classes('Atom')):
+        return {'const': checker.value}
+    if isinstance(checker, _trafaret_classes('List')):
+        fragment = {'type': 'array'}
+        items = trafaret_json_schema(checker.trafaret)
+        if items:
+            fragment['items'] = items
+        if checker.min_length:
+            fragment['minItems'] = checker.min_length
+        if checker.max_length is not None:
+            fragment['maxItems'] = checker.max_length
+        return fragment
+    if isinstance(checker, _trafaret_classes('Dict', 'Mapping')):
+        return {'type': 'object'}
+    return {}
+
 
-def trafaret_attr(trafaret, name='TrafaretAttribute'):
+def trafaret_attr(trafaret, name='TrafaretAttribute', cache_size=None):
     """
     trafaret_attr(trafaret) -> TrafaretPoweredAttribute subclass.
 
     TrafaretPoweredAttribute subclass factory.
+    Pass `cache_size` to memoize validation results (see froshki.Attribute).
     Usage:
     >>> import trafaret
     >>> from froshki import Froshki, validation_hook
@@ -63,5 +167,6 @@ def trafaret_attr(trafaret, name='TrafaretAttribute'):
         name, (TrafaretPoweredAttribute,),
         dict(
             trafaret=trafaret,
+            cache_size=cache_size,
         ),
     )
@@ -11,11 +11,13 @@
     :license: BSD, see LICENSE for more details.
 """
 
+from operator import attrgetter
 try:
     import voluptuous
 except ImportError:
     raise ImportError('voluptuous is not installed')
 from froshki import Attribute
+from froshki.ext import compile_check_loop
 
 
 class VoluptuousPoweredAttribute(Attribute):
@@ -37,12 +39,125 @@ class VoluptuousPoweredAttribute(Attribute):
         except voluptuous.Invalid as err:
             return False, err.msg
 
+    @classmethod
+    def compile_bulk_validator(klass, attributes):
+        """Build a validator running voluptuous schemas in one loop."""
+        return compile_check_loop(
+            VoluptuousPoweredAttribute, attributes,
+            attrgetter('schema'), voluptuous.Invalid, attrgetter('msg'),
+        )
+
+    @classmethod
+    def json_schema(klass):
+        return voluptuous_json_schema(klass.schema)
+
+
+# bool before int, its subclass.
+_JSON_TYPES = (
+    (bool, 'boolean'), (int, ['integer', 'boolean']), (float, 'number'),
+    (str, 'string'), (list, 'array'), (tuple, 'array'), (dict, 'object'),
+    (type(None), 'null'),
+)
+
+_LITERAL_TYPES = (bool, int, float, str)
+
+
+def voluptuous_json_schema(validator):
+    """
+    voluptuous_json_schema(validator) -> JSON Schema dict.
+
+    Maps a voluptuous schema to JSON Schema constraints where possible,
+    never rejecting inputs the schema accepts.
+    Unknown or coercing validators accept anything,
+    as do validators following them in All(...).
+    >>> from voluptuous import Schema, All, Range
+    >>> voluptuous_json_schema(Schema(All(int, Range(min=1))))
+    {'type': ['integer', 'boolean'], 'minimum': 1}
+    """
+    if isinstance(validator, voluptuous.Schema):
+        return voluptuous_json_schema(validator.schema)
+    if validator is None:
+        return {'type': 'null'}
+    if isinstance(validator, type):
+        for python_type, json_type in _JSON_TYPES:
+            if issubclass(validator, python_type):
+                return {'type': json_type}
+        return {}
+    if isinstance(validator, voluptuous.All):
+        fragments = []
+        for sub_validator in validator.validators:
+            fragment = voluptuous_json_schema(sub_validator)
+            if not fragment:
+                # Values may be converted for the rest.
+                break
+            fragments.append(fragment)
+        merged = {}
+        for fragment in fragments:
+            if set(fragment).intersection(merged):
+                return {'allOf': fragments}
+            merged.update(fragment)
+        return merged
+    if isinstance(validator, voluptuous.Any):
+        alternatives = [
+            voluptuous_json_schema(sub_validator)
+            for sub_validator in validator.validators
+        ]
+        if not alternatives or not all(alternatives):
+            return {}
+        return {'anyOf': alternatives}
+    if isinstance(validator, voluptuous.Range):
+        fragment = {}
+        if validator.min is not None:
+            if validator.min_included:
+                fragment['minimum'] = validator.min
+            else:
+                fragment['exclusiveMinimum'] = validator.min
+        if validator.max is not None:
+            if validator.max_included:
+                fragment['maximum'] = validator.max
+            else:
+                fragment['exclusiveMaximum'] = validator.max
+        return fragment
+    if isinstance(validator, voluptuous.Length):
+        # Each keyword only applies to values of its type.
+        fragment = {}
+        if validator.min is not None:
+            fragment.update(minLength=validator.min, minItems=validator.min,
+                            minProperties=validator.min)
+        if validator.max is not None:
+            fragment.update(maxLength=validator.max, maxItems=validator.max,
+                            maxProperties=validator.max)
+        return fragment
+    if isinstance(validator, voluptuous.In):
+        if (isinstance(validator.container, (list, tuple, set, frozenset))
+                and all(isinstance(choice, _LITERAL_TYPES)
+                        for choice in validator.container)):
+            return {'enum': list(validator.container)}
+        return {}
+    if isinstance(validator, voluptuous.Match):
+        return {'type': 'string', 'pattern': validator.pattern.pattern}
+    if isinstance(validator, list):
+        fragment = {'type': 'array'}
+        items = [
+            voluptuous_json_schema(sub_validator) for sub_validator in validator
+        ]
+        if items and all(items):
+            fragment['items'] = items[0] if len(items) == 1 else {'anyOf': items}
+        return fragment
+    if isinstance(validator, dict):
+        return {'type': 'object'}
+    if isinstance(validator, _LITERAL_TYPES):
+        return {'const': validator}
+    return {}
+
 
-def voluptuous_attr(voluptuous_schema, name='VoluptuousAttribute'):
+def voluptuous_attr(voluptuous_schema, name='VoluptuousAttribute',
+                    cache_size=None):
     """
     voluptuous_attr(voluptuous_schema) -> VoluptuousPoweredAttribute subclass.
 
     VoluptuousPoweredAttribute subclass factory.
+    Pass `cache_size` to memoize validation results (see froshki.Attribute).
     Usage:
     >>> from voluptuous import Schema, All, Length, Range
     >>> from froshki import Froshki, validation_hook
@@ -74,5 +189,6 @@ def voluptuous_attr(voluptuous_schema, name='VoluptuousAttribute'):
         name, (VoluptuousPoweredAttribute,),
         dict(
             schema=voluptuous_schema,
+            cache_size=cache_size,
         ),
     )
@@ -0,0 +1,255 @@
+# encoding: utf-8
+
+"""
+    froshki.instrument
+    ~~~~~~~~~~~~~~~~~~
+
+    Implements instrumentation of Froshki.validate, recording timings,
+    call counts, failures and exceptions per attribute and validation hook.
+
+    :copyright: (c) 2013 by ymat<drowse314@gmail.com>.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import contextlib
+import functools
+import sys
+import threading
+import time
+from .model import Attribute, _validation_observers
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+
+class ValidationObserver(object):
+    """
+    Base class for observers of Froshki validations.
+
+    Override ValidationObserver.record for customization.
+    """
+
+    def record(self, model_name, name, kind, seconds,
+               is_valid, exception_type=None):
+        """
+        Record a check of an attribute (kind='attribute')
+        or a validation hook (kind='hook').
+
+        `exception_type` is set when a transformation failed,
+        or the check raised an exception (with `is_valid` as None).
+        """
+        raise NotImplementedError
+
+
+class ValidationStats(ValidationObserver):
+    """
+    Aggregates timings & counters per model attributes and hooks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, model_name, name, kind, seconds,
+               is_valid, exception_type=None):
+        key = (model_name, name, kind)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = dict(
+                    calls=0, failures=0, seconds=0.0, exceptions={},
+                )
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            if not is_valid:
+                stats['failures'] += 1
+            if exception_type is not None:
+                exception_name = exception_type.__name__
+                exceptions = stats['exceptions']
+                exceptions[exception_name] = exceptions.get(exception_name, 0) + 1
+
+    def snapshot(self):
+        """
+        Copy of the statistics as a dict -> {'<model>.<name>': stats}.
+
+        Stats are dicts with keys 'model', 'name', 'kind', 'calls', 'failures',
+        'seconds' (total wall time) and 'exceptions' (counts by type name).
+        """
+        with self._lock:
+            snapshot = {}
+            for (model_name, name, kind), stats in self._stats.items():
+                entry = dict(stats, model=model_name, name=name, kind=kind)
+                entry['exceptions'] = dict(stats['exceptions'])
+                snapshot['{0}.{1}'.format(model_name, name)] = entry
+            return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self, prefix='froshki_validation'):
+        """Statistics in Prometheus text exposition format -> str."""
+        metrics = (
+            ('calls_total', 'counter', 'Number of checks.'),
+            ('failures_total', 'counter', 'Number of failed checks.'),
+            ('seconds_total', 'counter', 'Total wall time of checks in seconds.'),
+        )
+        snapshot = sorted(
+            self.snapshot().values(),
+            key=lambda entry: (entry['model'], entry['kind'], entry['name']),
+        )
+        lines = []
+        for metric, metric_type, help_text in metrics:
+            metric_name = '{0}_{1}'.format(prefix, metric)
+            lines.append('# HELP {0} {1}'.format(metric_name, help_text))
+            lines.append('# TYPE {0} {1}'.format(metric_name, metric_type))
+            stats_key = metric[:-len('_total')]
+            for entry in snapshot:
+                lines.append('{0}{{{1}}} {2}'.format(
+                    metric_name, _labels(entry), entry[stats_key],
+                ))
+        metric_name = '{0}_exceptions_total'.format(prefix)
+        lines.append('# HELP {0} Number of exceptions by type.'.format(metric_name))
+        lines.append('# TYPE {0} counter'.format(metric_name))
+        for entry in snapshot:
+            for exception_name in sorted(entry['exceptions']):
+                lines.append('{0}{{{1},exception="{2}"}} {3}'.format(
+                    metric_name, _labels(entry), exception_name,
+                    entry['exceptions'][exception_name],
+                ))
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(entry):
+    return 'model="{0}",name="{1}",kind="{2}"'.format(
+        entry['model'], entry['name'], entry['kind'],
+    )
+
+
+def add_observer(observer):
+    """Start observing validations of all Froshki objects, in all threads."""
+    _validation_observers.append(observer)
+
+
+def remove_observer(observer):
+    _validation_observers.remove(observer)
+
+
+@contextlib.contextmanager
+def instrument(observer=None):
+    """
+    Observe validations while in the context -> observer (ValidationStats by default).
+
+    The observer is registered process-wide, as by add_observer, so it also
+    records validations run by other threads in the meantime.
+    Usage:
+    >>> from froshki import Froshki, Attribute
+    >>> class Download(Froshki):
+    ...     resource_id = Attribute()
+    ...     filetype = Attribute()
+    >>> with instrument() as stats:
+    ...     download = Download(resource_id='9', filetype='pdf')
+    ...     download.validate()
+    True
+    >>> stats.snapshot()['Download.resource_id']['calls']
+    1
+    """
+    if observer is None:
+        observer = ValidationStats()
+    add_observer(observer)
+    try:
+        yield observer
+    finally:
+        remove_observer(observer)
+
+
+def _notify(observers, *args):
+    for observer in observers:
+        observer.record(*args)
+
+
+def _check_attribute(attr_obj, input_value):
+    """Attribute._validate, also reporting conversion error types."""
+    if (attr_obj._validate.__func__ is not Attribute._validate.__func__
+            or attr_obj.cache_size):
+        is_valid, value_to_store = attr_obj._validate(input_value)
+        return is_valid, value_to_store, None
+    try:
+        value_to_store = attr_obj.transform(input_value)
+    except:
+        # Any exception, as Attribute._validate_uncached.
+        return (
+            False, 'data conversion error: {}'.format(input_value),
+            sys.exc_info()[0],
+        )
+    is_valid, value_to_store = attr_obj.validate(value_to_store)
+    return is_valid, value_to_store, None
+
+
+def observed_validate(froshki, observers):
+    """Froshki.validate, reporting each check to `observers`."""
+    check_attr, check_hook = observed_checks(froshki, observers)
+    is_valid = True
+    attrs_to_validate = froshki._attrs_to_validate()
+    for attr_name in attrs_to_validate:
+        attr_is_valid, value_to_store = check_attr(attr_name)
+        froshki._set_attr_validation_data(
+            attr_name, attr_is_valid, value_to_store
+        )
+        is_valid &= attr_is_valid
+    is_valid &= froshki._kept_errors_validity()
+    is_valid &= froshki._reused_hooks_validity(attrs_to_validate)
+    for validator_name in froshki._hooks_to_validate(attrs_to_validate):
+        is_valid &= check_hook(validator_name)
+    froshki._clear_yet_to_validate()
+    return is_valid
+
+
+def observed_checks(froshki, observers):
+    """
+    Checks of attributes & validation hooks, reporting to `observers`
+    -> (check_attr, check_hook).
+
+    As Froshki._validate_attr_data & Froshki._handle_validation_hook.
+    """
+    return (
+        functools.partial(_observed_attr_check, froshki, observers),
+        functools.partial(_observed_hook_check, froshki, observers),
+    )
+
+
+def _observed_attr_check(froshki, observers, attr_name):
+    schema = froshki._schema
+    model_name = froshki.__class__.__name__
+    attr_data = froshki._get_attr_data(attr_name)
+    start = timer()
+    try:
+        if attr_data is None and attr_name in schema.nullable_attrs:
+            attr_is_valid, value_to_store, exception_type = True, None, None
+        else:
+            attr_is_valid, value_to_store, exception_type = _check_attribute(
+                schema.attributes[attr_name], attr_data,
+            )
+    except Exception as err:
+        _notify(observers, model_name, attr_name, 'attribute',
+                timer() - start, None, type(err))
+        raise
+    _notify(observers, model_name, attr_name, 'attribute',
+            timer() - start, attr_is_valid, exception_type)
+    return attr_is_valid, value_to_store
+
+
+def _observed_hook_check(froshki, observers, validator_name):
+    model_name = froshki.__class__.__name__
+    start = timer()
+    try:
+        hook_is_valid = froshki._handle_validation_hook(validator_name)
+    except Exception as err:
+        _notify(observers, model_name, validator_name, 'hook',
+                timer() - start, None, type(err))
+        raise
+    _notify(observers, model_name, validator_name, 'hook',
+            timer() - start, hook_is_valid)
+    return hook_is_valid
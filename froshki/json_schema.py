@@ -0,0 +1,101 @@
+# encoding: utf-8
+
+"""
+    froshki.json_schema
+    ~~~~~~~~~~~~~~~~~~~
+
+    Implements export of Froshki models to JSON Schema,
+    for pre-validation of inputs before they reach Froshki objects.
+
+    :copyright: (c) 2013 by ymat<drowse314@gmail.com>.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import json
+
+DIALECT = 'https://json-schema.org/draft/2020-12/schema'
+
+
+def nullable(fragment):
+    """JSON Schema also accepting null -> dict."""
+    if not fragment:
+        return fragment
+    return {'anyOf': [fragment, {'type': 'null'}]}
+
+
+def rejects_null(fragment):
+    """If a JSON Schema surely rejects null -> boolean."""
+    types = fragment.get('type')
+    if types is None:
+        return False
+    if not isinstance(types, list):
+        types = [types]
+    return 'null' not in types
+
+
+def _is_json_value(value):
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def object_schema(model):
+    """
+    object_schema(model) -> JSON Schema of attribute sources of the model.
+
+    Attributes are accepted by names & key aliases, and required when
+    not nullable, without defaults, and their JSON Schema rejects null.
+    Nothing is required for partial models (see Froshki.partial_validation).
+    """
+    schema = model.get_schema()
+    defaults = {}
+    for key in model.default_values:
+        defaults[schema.key_map.get(key, key)] = model.default_values[key]
+    properties = {}
+    required = []
+    required_either = []
+    for name in schema.attr_names:
+        attr_obj = schema.attributes[name]
+        fragment = dict(attr_obj.json_schema())
+        must_be_set = (
+            not model.partial_validation
+            and not attr_obj.nullable and rejects_null(fragment)
+        )
+        if attr_obj.nullable:
+            fragment = nullable(fragment)
+        if name in defaults:
+            must_be_set = False
+            if _is_json_value(defaults[name]):
+                fragment['default'] = defaults[name]
+        properties[name] = fragment
+        alias = attr_obj.key_alias
+        if alias is not None:
+            properties[alias] = fragment
+        if must_be_set:
+            if alias is None:
+                required.append(name)
+            else:
+                required_either.append({'anyOf': [
+                    {'required': [name]}, {'required': [alias]},
+                ]})
+    object_schema = {
+        'title': model.__name__,
+        'type': 'object',
+        'properties': properties,
+    }
+    if required:
+        object_schema['required'] = required
+    if required_either:
+        object_schema['allOf'] = required_either
+    if not model.ignore_unknown_keys:
+        object_schema['additionalProperties'] = False
+    return object_schema
+
+
+def model_json_schema(model):
+    """model_json_schema(model) -> JSON Schema document of the model."""
+    document = {'$schema': DIALECT}
+    document.update(object_schema(model))
+    return document
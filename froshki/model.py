@@ -10,15 +10,96 @@
     :license: BSD, see LICENSE for more details.
 """
 
+import functools
+import inspect
+import itertools
+import sys
+import threading
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+try:
+    from types import MappingProxyType as _mapping_view
+except ImportError:
+    _mapping_view = None
+# No validation caches on Python 2, validate uncached instead.
+_lru_cache = getattr(functools, 'lru_cache', None)
+# No coroutine functions on Python 2.
+_iscoroutinefunction = getattr(
+    inspect, 'iscoroutinefunction', lambda function: False,
+)
+
+
+class _MappingView(Mapping):
+    """
+    Read-only view of a dict, for Python 2 without types.MappingProxyType.
+    """
+
+    __slots__ = ('_mapping',)
+
+    def __init__(self, mapping):
+        self._mapping = mapping
+
+    def __getitem__(self, key):
+        return self._mapping[key]
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __len__(self):
+        return len(self._mapping)
+
+    def __contains__(self, key):
+        return key in self._mapping
+
+    def copy(self):
+        return self._mapping.copy()
+
+if _mapping_view is None:
+    _mapping_view = _MappingView
+
+
+# Observers of validations, registered by froshki.instrument.
+_validation_observers = []
+
+# Serializes schema compilations, reentrant for recompilation of subclasses.
+_compile_lock = threading.RLock()
+
+# Limit of partial validation plans cached per schema.
+_PARTIAL_PLANS_LIMIT = 256
+
+# froshki.aio, imported on first use to keep asyncio out of startup.
+_aio = None
+
+
+def _import_aio():
+    global _aio
+    from . import aio
+    _aio = aio
+    return aio
+
 
 class Attribute(object):
     """
     Base class for Froshki objects' attributes.
+
+    Set `cache_size` on subclasses to memoize validation results
+    of hashable input values, in a LRU cache per subclass (Python 3 only).
+    Cached transformed values are shared, so must not be mutated.
+    Attributes with coroutine methods cannot be cached.
+    Set `cost` (on subclasses or by argument) to the relative cost of
+    validation, cheaper attributes are validated first in fail-fast mode.
     """
 
-    def __init__(self, nullable=False, key_alias=None):
+    cache_size = None
+    cost = 0
+
+    def __init__(self, nullable=False, key_alias=None, cost=None):
         self._nullable = nullable
         self._key_alias = key_alias
+        if cost is not None:
+            self.cost = cost
 
     @property
     def nullable(self):
@@ -51,15 +132,158 @@ class Attribute(object):
         """
         return True, input_value
 
+    @classmethod
+    def transform_batch(klass, input_values):
+        """
+        Transform a sequence of input values at once.
+
+        klass.transform_batch(input_values) -> values_to_store
+        Any exception falls back to per-value transformation to locate errors.
+        Override this method for customization, e.g. vectorized conversions.
+        """
+        transform = klass.transform
+        return [transform(input_value) for input_value in input_values]
+
+    @classmethod
+    def validate_batch(klass, input_values):
+        """
+        Validate a sequence of (transformed) input values at once.
+
+        klass.validate_batch(input_values)
+            -> validities, values_or_error_messages
+        Both sequences are to be ordered as `input_values`.
+        Override this method for customization.
+        """
+        validate = klass.validate
+        results = [validate(input_value) for input_value in input_values]
+        return (
+            [result[0] for result in results],
+            [result[1] for result in results],
+        )
+
+    @classmethod
+    def encode(klass, value):
+        """
+        Encode stored values for serialization, e.g. into JSON.
+
+        klass.encode(value) -> primitive value
+        Override this method for customization, e.g. for dates.
+        """
+        return value
+
+    @classmethod
+    def json_schema(klass):
+        """
+        JSON Schema of accepted input values -> dict.
+
+        Constraints must not be stricter than the validation,
+        an empty dict (accepting anything) by default.
+        Override this method for customization.
+        """
+        return {}
+
+    @classmethod
+    def cache_info(klass):
+        """
+        Statistics of the validation cache of the class
+        -> functools.lru_cache info (hits, misses, maxsize, currsize) or None.
+        """
+        cache = klass.__dict__.get('_validation_cache')
+        if cache is None:
+            return None
+        return cache.cache_info()
+
+    @classmethod
+    def cache_clear(klass):
+        cache = klass.__dict__.get('_validation_cache')
+        if cache is not None:
+            cache.cache_clear()
+
     @classmethod
     def _validate(klass, input_value):
         """Validation hook for Froshki object."""
+        if klass.cache_size and _lru_cache is not None:
+            return klass._validate_cached(input_value)
+        return klass._validate_uncached(input_value)
+
+    @classmethod
+    def compile_bulk_validator(klass, attributes):
+        """
+        Build a validator of many attributes at once, or None if unsupported.
+
+        klass.compile_bulk_validator({name: attribute, ...})
+            -> bulk_validator(data) -> (values_to_store, error_messages)
+        Called when `Froshki.bulk_validation` is set and all attributes
+        of the model share this method, e.g. to run checks of a validation
+        library in one loop, without per-attribute method dispatch.
+        `data` maps all the attribute names to input values (None if unset),
+        not to be modified, and results map attribute names to transformed
+        values or errors as Attribute._validate does, including nullable ones.
+        """
+        return None
+
+    @classmethod
+    def _validate_uncached(klass, input_value):
         try:
             value_to_store = klass.transform(input_value)
         except:
             return False, 'data conversion error: {}'.format(input_value)
         return klass.validate(value_to_store)
 
+    @classmethod
+    def _validate_cached(klass, input_value):
+        try:
+            hash(input_value)
+        except TypeError:
+            return klass._validate_uncached(input_value)
+        cache = klass.__dict__.get('_validation_cache')
+        if cache is None:
+            # Values equal but typed differently (1, 1.0, True) are cached apart.
+            cache = _lru_cache(maxsize=klass.cache_size, typed=True)(
+                klass._validate_uncached
+            )
+            setattr(klass, '_validation_cache', cache)
+        return cache(input_value)
+
+    @classmethod
+    def _validate_batch(klass, input_values):
+        """Batched validation hook for Froshki.validate_many."""
+        validate = klass._validate
+        if (validate.__func__ is not Attribute._validate.__func__
+                or klass.cache_size):
+            # Respect customized or cached per-value validation.
+            results = [validate(input_value) for input_value in input_values]
+            return (
+                [result[0] for result in results],
+                [result[1] for result in results],
+            )
+        try:
+            values_to_store = klass.transform_batch(input_values)
+        except:
+            values_to_store = []
+            failures = {}
+            for index, input_value in enumerate(input_values):
+                try:
+                    values_to_store.append(klass.transform(input_value))
+                except:
+                    values_to_store.append(None)
+                    failures[index] = 'data conversion error: {}'.format(
+                        input_value
+                    )
+            if failures:
+                validities, results = klass.validate_batch(
+                    [value for index, value in enumerate(values_to_store)
+                     if index not in failures]
+                )
+                validities, results = iter(validities), iter(results)
+                return (
+                    [False if index in failures else next(validities)
+                     for index in range(len(values_to_store))],
+                    [failures[index] if index in failures else next(results)
+                     for index in range(len(values_to_store))],
+                )
+        return klass.validate_batch(values_to_store)
+
 
 class AttributeDescriptor(object):
     """
@@ -78,6 +302,8 @@ class AttributeDescriptor(object):
         if not instance:
             return self._attr
         else:
+            if instance.lazy_validation:
+                instance._validate_lazily(self._attr_name)
             return instance._get_attr_data(self._attr_name)
 
     def __set__(self, instance, value):
@@ -113,35 +339,288 @@ class ValidatorMethod(object):
     >>> modify_password = ModifyPassword(user_id='ymat', old_password='vxf', new_password='f8a73', confirm_new_password='f8a773')
     >>> modify_password.validate()
     False
+
+    Hooks declaring attributes they depend on are rerun only when
+    any of them has been validated again, reusing the last result otherwise:
+    >>> class ModifyPasswordOnce(ModifyPassword):
+    ...     @validation_hook.extend(depends=('new_password', 'confirm_new_password'))
+    ...     def confirm_password(self):
+    ...         return self.new_password == self.confirm_new_password
     """
 
-    def __init__(self, validator_method, error=None):
+    def __init__(self, validator_method, error=None, depends=None):
         self._validator = validator_method
         self._error = error
+        if depends is not None:
+            depends = tuple(depends)
+        self._depends = depends
 
     @property
     def error(self):
         return self._error
 
+    @property
+    def depends(self):
+        return self._depends
+
     def validate(self, attr_name, froshki):
         return self._validator(froshki)
 
     @classmethod
-    def extend(klass, error=None):
+    def extend(klass, error=None, depends=None):
         def _validation_hook(validator_method):
             return klass(
                 validator_method,
                 error=error,
+                depends=depends,
             )
         return _validation_hook
 
 validation_hook = ValidatorMethod
 
 
-class Froshki(object):
+class ModelSchema(object):
+    """
+    Compiled per-class schema of a Froshki subclass.
+
+    Holds everything Froshki instances need to look up on their class,
+    so that instantiation and validation need no reflection over the MRO.
+    Built by Froshki.compile_schema(), and rebuilt when the class is mutated.
+    """
+
+    def __init__(self, klass, attr_names, attr_aliases, extra_validators):
+        self.model = klass
+        registered = []
+        for name in attr_names:
+            # Names found in both the class and its bases are registered once.
+            if name not in registered:
+                registered.append(name)
+        self.attr_names = tuple(registered)
+        self.attr_indexes = dict(
+            (name, index) for index, name in enumerate(self.attr_names)
+        )
+        self.attr_aliases = dict(attr_aliases)
+        # Attribute names by source keys, i.e. names & aliases.
+        self.key_map = dict((name, name) for name in self.attr_names)
+        self.key_map.update(self.attr_aliases)
+        self.descriptors = dict(
+            (name, _lookup_class_dict(klass, name))
+            for name in self.attr_names
+        )
+        self.attributes = dict(
+            (name, getattr(klass, name))
+            for name in self.attr_names
+        )
+        self.nullable_attrs = frozenset(
+            name for name in self.attr_names
+            if self.attributes[name].nullable
+        )
+        # Cheaper attributes first, then in declaration order.
+        self.validation_order = tuple(sorted(
+            self.attr_names, key=lambda name: self.attributes[name].cost,
+        ))
+        self.bulk_validator = None
+        if klass.bulk_validation:
+            self.bulk_validator = _compile_bulk_validator(
+                self.attr_names, self.attributes,
+            )
+        self.extra_validators = tuple(extra_validators)
+        self.hooks = dict(
+            (name, getattr(klass, name))
+            for name in self.extra_validators
+        )
+        self.hook_dependencies = {}
+        for name in self.extra_validators:
+            depends = self.hooks[name].depends
+            if depends is None:
+                continue
+            for attr_name in depends:
+                if attr_name not in self.attributes:
+                    raise TypeError(
+                        "'{klass}' has no attirbute {attr} for hook {hook}".format(
+                            klass=klass.__name__,
+                            attr=attr_name,
+                            hook=name,
+                        )
+                    )
+            self.hook_dependencies[name] = frozenset(depends)
+        # Serialization plans by option, built by froshki.codec.
+        self.encoding_plans = {}
+        # Built by Froshki.json_schema.
+        self.json_schema = None
+        # Partial validation plans by frozenset of keys, see _partial_plan.
+        self.partial_plans = {}
+        async_attrs = [
+            name for name in self.attr_names
+            if _iscoroutinefunction(self.attributes[name].transform)
+            or _iscoroutinefunction(self.attributes[name].validate)
+        ]
+        for name in async_attrs:
+            if self.attributes[name].cache_size:
+                # Awaitables would be cached instead of results.
+                raise TypeError(
+                    "'{klass}' attribute {attr} has coroutine methods, "
+                    "which cannot be cached with cache_size".format(
+                        klass=klass.__name__,
+                        attr=name,
+                    )
+                )
+        # Coroutine attribute methods or hooks, only for Froshki.avalidate.
+        self.is_async = bool(async_attrs) or any(
+            _iscoroutinefunction(getattr(hook, '_validator', None))
+            for hook in self.hooks.values()
+        )
+        # Specialized methods, set when `Froshki.generate_methods` is on.
+        self.generated_init = None
+        self.generated_validate = None
+
+
+def _compile_bulk_validator(attr_names, attributes):
+    if not attr_names:
+        return None
+    compile_bulk = type(attributes[attr_names[0]]).compile_bulk_validator
+    for name in attr_names:
+        other = type(attributes[name]).compile_bulk_validator
+        if other.__func__ is not compile_bulk.__func__:
+            return None
+    return compile_bulk(attributes)
+
+
+def _check_sync(schema):
+    """Raise TypeError if the schema can be validated only asynchronously."""
+    if schema.is_async:
+        raise TypeError(
+            "'{klass}' has coroutine attribute methods or validation hooks, "
+            "use avalidate() instead".format(klass=schema.model.__name__)
+        )
+
+
+def _partial_plan(schema, keys):
+    """
+    Plan of partial validation of attributes by names or aliases -> tuple.
+
+    (names of the attributes in ModelSchema.validation_order,
+    names of validation hooks whose declared dependencies are all of them)
+    Hooks not declaring dependencies are left out.
+    """
+    keys = frozenset(keys)
+    plan = schema.partial_plans.get(keys)
+    if plan is not None:
+        return plan
+    attr_names = set()
+    for key in keys:
+        name = schema.key_map.get(key)
+        if name is None:
+            raise TypeError(
+                "'{klass}' has no attirbute {attr}".format(
+                    klass=schema.model.__name__,
+                    attr=key,
+                )
+            )
+        attr_names.add(name)
+    hook_dependencies = schema.hook_dependencies
+    plan = (
+        tuple(name for name in schema.validation_order if name in attr_names),
+        tuple(
+            validator_name for validator_name in schema.extra_validators
+            if validator_name in hook_dependencies
+            and hook_dependencies[validator_name] <= attr_names
+        ),
+    )
+    if len(schema.partial_plans) < _PARTIAL_PLANS_LIMIT:
+        schema.partial_plans[keys] = plan
+    return plan
+
+
+def _source_keys(key_map, attr_source, ignore_unknown_keys):
+    """
+    Keys of an attribute source to look up -> iterable.
+
+    When unknown keys are ignored and the source has more keys than the model
+    accepts, known keys are looked up in the source instead.
+    Keys are in source order either way when a name & its alias are both
+    given, so that the latter one takes precedence as usual.
+    """
+    if ignore_unknown_keys and len(attr_source) > len(key_map):
+        keys = [key for key in key_map if key in attr_source]
+        if len(set(key_map[key] for key in keys)) == len(keys):
+            return keys
+    return attr_source
+
+
+def _lookup_class_dict(klass, name):
+    for base in klass.__mro__:
+        if name in base.__dict__:
+            return base.__dict__[name]
+    raise AttributeError(name)
+
+
+class FroshkiMeta(type):
+    """
+    Metaclass keeping compiled schemas of Froshki subclasses up to date.
+
+    Assigning or deleting class attributes recompiles the schema of
+    the class and its subclasses which have been compiled already.
+    Also keeps subclasses of compact models free of instance __dict__.
+
+    Mixing in classes with other metaclasses, e.g. abc.ABC, needs
+    a metaclass derived from both:
+    >>> import abc
+    >>> class ABCFroshkiMeta(FroshkiMeta, abc.ABCMeta):
+    ...     pass
+    >>> class Sized(abc.ABC):
+    ...     @abc.abstractmethod
+    ...     def size(self):
+    ...         pass
+    >>> Shipment = ABCFroshkiMeta('Shipment', (Froshki, Sized), {
+    ...     'weight': Attribute(), 'size': lambda self: self.weight,
+    ... })
+    >>> Shipment(weight=3).size()
+    3
+    """
+
+    def __new__(meta, name, bases, namespace):
+        compact = any(
+            getattr(base, '_compact_storage', False) for base in bases
+        )
+        if compact and '__slots__' not in namespace:
+            namespace['__slots__'] = ()
+        # Cooperative with other metaclasses combined in subclasses.
+        return super(FroshkiMeta, meta).__new__(meta, name, bases, namespace)
+
+    def __setattr__(klass, name, value):
+        type.__setattr__(klass, name, value)
+        klass._recompile_schemas()
+
+    def __delattr__(klass, name):
+        type.__delattr__(klass, name)
+        klass._recompile_schemas()
+
+    def _recompile_schemas(klass):
+        with _compile_lock:
+            for subclass in _iter_subclasses(klass):
+                if subclass.__dict__.get('_schema') is not None:
+                    subclass.compile_schema()
+
+
+def _iter_subclasses(klass):
+    yield klass
+    for subclass in type.__subclasses__(klass):
+        for descendant in _iter_subclasses(subclass):
+            yield descendant
+
+
+# Apply the metaclass in a way compatible with Python 2 & 3.
+_FroshkiBase = FroshkiMeta('_FroshkiBase', (object,), {'__slots__': ()})
+
+
+class Froshki(_FroshkiBase):
     """
     Base class for Froshki objetcs.
 
+    Froshki has no instance __dict__ for the sake of CompactFroshki,
+    so Froshki() itself creates instances of a subclass of the same name:
+    check them with isinstance() rather than type().
     Basic usage:
     >>> # Define attribute types.
     >>> class ResourceId(Attribute):
@@ -190,26 +669,123 @@ class Froshki(object):
     'ymat'
     """
 
+    __slots__ = ()
+
     default_values = {}
     ignore_unknown_keys = False
+    revalidate_errors = True
+    generate_methods = False
+    lazy_validation = False
+    bulk_validation = False
+    partial_validation = False
 
     _attribute_class = Attribute
     _descriptor_class = AttributeDescriptor
 
+    _schema = None
+    # Last results of validation hooks declaring dependencies.
+    _hook_results = None
+    # Set when attributes were validated on access after the last validation.
+    _summary_stale = True
+
     def __new__(klass, *args, **kwargs):
+        if klass is Froshki:
+            klass = _BareFroshki
+        if klass.__dict__.get('_schema') is None:
+            klass.get_schema()
+        instance = object.__new__(klass)
+        return instance
+
+    @classmethod
+    def get_schema(klass):
+        """Get the ModelSchema of the class, compiling if not yet -> ModelSchema."""
+        schema = klass.__dict__.get('_schema')
+        if schema is None:
+            with _compile_lock:
+                # Compiled by another thread while waiting?
+                schema = klass.__dict__.get('_schema')
+                if schema is None:
+                    schema = klass.compile_schema()
+        return schema
+
+    @classmethod
+    def partial(klass):
+        """
+        Variant of the class for partial updates -> Froshki subclass.
+
+        The subclass validates only attributes given values,
+        without default values, and validation hooks whose declared
+        dependencies are all given (see Froshki.partial_validation).
+        Created once per class.
+        >>> class User(Froshki):
+        ...     name = Attribute()
+        ...     email = Attribute()
+        >>> PatchUser = User.partial()
+        >>> patch_user = PatchUser(email='drowse314@gmail.com')
+        >>> patch_user.validate()
+        True
+        >>> patch_user.data
+        {'email': 'drowse314@gmail.com'}
+        """
+        if klass.__dict__.get('partial_validation'):
+            return klass
+        partial_model = klass.__dict__.get('_partial_model')
+        if partial_model is None:
+            with _compile_lock:
+                partial_model = klass.__dict__.get('_partial_model')
+                if partial_model is None:
+                    def find_extra_validators(partial_model):
+                        # Validation hooks are not inherited, share the model's.
+                        return klass.find_extra_validators()
+                    partial_model = type(klass)(klass.__name__, (klass,), dict(
+                        __slots__=(),
+                        __module__=klass.__module__,
+                        default_values={},
+                        partial_validation=True,
+                        find_extra_validators=classmethod(find_extra_validators),
+                    ))
+                    # Bypass FroshkiMeta.__setattr__, not to trigger recompilation.
+                    type.__setattr__(klass, '_partial_model', partial_model)
+        return partial_model
+
+    @classmethod
+    def compile_schema(klass):
+        """
+        Build and store the ModelSchema of the class -> ModelSchema.
 
+        Called on the first instantiation, and again on class mutations.
+        Call this explicitly after modifying attribute mixins in place.
+        The schema is published only after the class is fully set up,
+        and compilations are serialized among threads.
+        """
+        with _compile_lock:
+            return klass._compile_schema()
+
+    @classmethod
+    def _compile_schema(klass):
         attr_names, attr_aliases = klass.find_attributes()
         inherited_attrs, inherited_aliases = klass.find_attributes_in_bases()
         attr_names.extend(inherited_attrs)
-        attr_aliases.update(inherited_aliases)
-        setattr(klass, '_registered_attrs', tuple(attr_names))
-        setattr(klass, '_attr_aliases', attr_aliases)
-
+        for alias in inherited_aliases:
+            # Aliases defined nearer in the MRO take precedence.
+            attr_aliases.setdefault(alias, inherited_aliases[alias])
         extra_validators = klass.find_extra_validators()
-        setattr(klass, '_extra_validators', tuple(extra_validators))
-
-        instance = object.__new__(klass)
-        return instance
+        schema = ModelSchema(
+            klass, attr_names, attr_aliases, extra_validators,
+        )
+        if klass.generate_methods:
+            from .codegen import generate_init, generate_validate
+            schema.generated_init = generate_init(schema)
+            if not klass.lazy_validation:
+                schema.generated_validate = generate_validate(
+                    schema, Attribute, klass.revalidate_errors,
+                )
+        # Bypass FroshkiMeta.__setattr__, not to trigger recompilation.
+        type.__setattr__(klass, '_registered_attrs', schema.attr_names)
+        type.__setattr__(klass, '_attr_aliases', schema.attr_aliases)
+        type.__setattr__(klass, '_extra_validators', schema.extra_validators)
+        type.__setattr__(klass, '_schema', schema)
+        return schema
 
     @classmethod
     def find_attributes(klass):
@@ -225,7 +801,7 @@ class Froshki(object):
                 attr_descriptor = descriptor_class(
                     name, obj,
                 )
-                setattr(klass, name, attr_descriptor)
+                type.__setattr__(klass, name, attr_descriptor)
                 if obj.key_alias is not None:
                     attr_aliases[obj.key_alias] = name
             elif isinstance(obj, descriptor_class):
@@ -241,9 +817,13 @@ class Froshki(object):
         attr_aliases = {}
         attribute_class = klass._attribute_class
         descriptor_class = klass._descriptor_class
+        # Names nearer in the MRO shadow the ones in further bases.
+        found_names = set(klass.__dict__)
         for base in klass.mro()[1:]:
             base_dict = base.__dict__
             for name in base_dict:
+                if name in found_names:
+                    continue
                 obj = base_dict[name]
                 if isinstance(obj, attribute_class):
                     attr_names.append(name)
@@ -251,15 +831,16 @@ class Froshki(object):
                         name, obj,
                     )
                     # No modifications to the base class.
-                    setattr(klass, name, attr_descriptor)
+                    type.__setattr__(klass, name, attr_descriptor)
                     if obj.key_alias is not None:
-                        attr_aliases[obj.key_alias] = name
+                        attr_aliases.setdefault(obj.key_alias, name)
                 # Also capture `descriptor_class` instances, for the cases when its bases
                 # have been instantiated before subclassed.
                 elif isinstance(obj, descriptor_class):
                     attr_names.append(name)
                     if obj.attr_key_alias is not None:
-                        attr_aliases[obj.attr_key_alias] = name
+                        attr_aliases.setdefault(obj.attr_key_alias, name)
+            found_names.update(base_dict)
         return attr_names, attr_aliases
 
     @classmethod
@@ -274,6 +855,13 @@ class Froshki(object):
 
     def __init__(self, source=None, ignore_unknown_keys=None,
                  **init_attrs_by_kws):
+        generated_init = self._schema.generated_init
+        if generated_init is not None:
+            generated_init(
+                self, source=source, ignore_unknown_keys=ignore_unknown_keys,
+                **init_attrs_by_kws
+            )
+            return
         self._data = {}
         # Override class attribute.
         if ignore_unknown_keys is not None:
@@ -291,36 +879,96 @@ class Froshki(object):
         self._yet_to_validate = set(self._registered_attrs)
         self._errors = {}
 
+    def reset(self, source=None, ignore_unknown_keys=None,
+              **init_attrs_by_kws):
+        """
+        Reinitialize attributes as __init__ does, reusing containers -> self.
+
+        Clears stored values, errors and validation state in place.
+        """
+        self._data.clear()
+        errors = self._errors
+        if errors:
+            errors.clear()
+        if self._hook_results:
+            self._hook_results.clear()
+        if self.lazy_validation:
+            self.__dict__.pop('_summary_stale', None)
+        if ignore_unknown_keys is not None:
+            self.ignore_unknown_keys = ignore_unknown_keys
+        elif 'ignore_unknown_keys' in self.__dict__:
+            del self.ignore_unknown_keys
+        self._source_attr_defaults()
+        if source is not None:
+            self._init_attrs(
+                source,
+                ignore_unknown_keys=self.ignore_unknown_keys,
+            )
+        if init_attrs_by_kws:
+            self._init_attrs(init_attrs_by_kws)
+        yet_to_validate = self._yet_to_validate
+        yet_to_validate.clear()
+        yet_to_validate.update(self._registered_attrs)
+        return self
+
     @property
     def errors(self):
+        if self.lazy_validation:
+            self._ensure_validated()
         return self._errors.copy()
 
     @property
     def data(self):
+        if self.lazy_validation:
+            self._ensure_validated()
         return self._data.copy()
 
+    @property
+    def errors_view(self):
+        """
+        Read-only view of the error messages, without copying.
+
+        Views reflect later validations, call .copy() to keep a snapshot.
+        """
+        if self.lazy_validation:
+            self._ensure_validated()
+        return _mapping_view(self._errors)
+
+    @property
+    def data_view(self):
+        """
+        Read-only view of the attribute values, without copying.
+
+        Views reflect later assignments & validations,
+        call .copy() to keep a snapshot.
+        """
+        return _mapping_view(self._attr_values())
+
+    def _attr_values(self):
+        """Attribute values in storage, not to be modified -> mapping."""
+        if self.lazy_validation:
+            self._ensure_validated()
+        return self._data
+
     def _source_attr_defaults(self):
-        self._init_attrs(self.__class__.default_values)
+        default_values = self.__class__.default_values
+        if default_values:
+            self._init_attrs(default_values)
 
     def _init_attrs(self, attr_source, ignore_unknown_keys=False):
-        registered_attrs = self._registered_attrs
-        attr_aliases = self._attr_aliases
-        for name in attr_source:
-            if name in registered_attrs:
+        key_map = self._schema.key_map
+        for key in _source_keys(key_map, attr_source, ignore_unknown_keys):
+            name = key_map.get(key)
+            if name is not None:
                 self._set_attr_data(
-                    name, attr_source[name],
-                    mark_as_unvalidated=False,
-                )
-            elif name in attr_aliases:
-                self._set_attr_data(
-                    attr_aliases[name], attr_source[name],
+                    name, attr_source[key],
                     mark_as_unvalidated=False,
                 )
             elif not ignore_unknown_keys:
                 raise TypeError(
                     "'{klass}' has no attirbute {attr}".format(
                         klass=self.__class__.__name__,
-                        attr=name,
+                        attr=key,
                     )
                 )
 
@@ -333,32 +981,276 @@ class Froshki(object):
     def _get_attr_data(self, name):
         return self._data.get(name, None)
 
-    def validate(self):
+    def validate(self, fail_fast=False, only=None):
         """
         Validate input/stored values -> boolean.
 
         Also store error messages if input is invalid.
+        Raises TypeError for models with coroutine methods, see Froshki.avalidate.
+        With `fail_fast`, attributes are validated by ascending Attribute.cost
+        and validation stops on the first failure, leaving the rest to validate.
+        With `only`, names or key aliases of attributes, validation covers
+        only them and validation hooks whose declared dependencies are all
+        among them, leaving the other attributes to validate.
         """
+        if self._schema.is_async:
+            _check_sync(self._schema)
+        if only is not None:
+            return self._validate_partially(only, fail_fast=fail_fast)
+        if self.partial_validation:
+            return self._validate_partially(
+                self._supplied_attrs(), fail_fast=fail_fast, settle=True,
+            )
+        if fail_fast:
+            return self._validate_fail_fast()
+        if _validation_observers:
+            return instrument.observed_validate(self, _validation_observers)
+        generated_validate = self._generated_validate()
+        if generated_validate is not None:
+            return generated_validate(self)
         is_valid = True
+        attrs_to_validate = self._attrs_to_validate()
+        bulk_validator = self._schema.bulk_validator
+        if (bulk_validator is not None
+                and len(attrs_to_validate) == len(self._schema.attr_names)):
+            is_valid &= self._validate_attrs_in_bulk(bulk_validator)
+        else:
+            for attr_name in attrs_to_validate:
+                attr_is_valid, value_to_store = self._validate_attr_data(attr_name)
+                self._set_attr_validation_data(
+                    attr_name, attr_is_valid, value_to_store
+                )
+                is_valid &= attr_is_valid
+        is_valid &= self._kept_errors_validity()
+        is_valid &= self._validate_hooks(attrs_to_validate)
+        self._clear_yet_to_validate()
+        return is_valid
+
+    def _generated_validate(self):
+        """Validation method generated for the class, if any -> function."""
+        return self._schema.generated_validate
+
+    def _validate_attrs_in_bulk(self, bulk_validator):
+        """Validate all attributes with ModelSchema.bulk_validator -> boolean."""
+        values_to_store, error_messages = bulk_validator(
+            self._attr_data_by_names()
+        )
+        self._store_validated(values_to_store)
+        for attr_name in error_messages:
+            self._set_attr_validation_data(
+                attr_name, False, error_messages[attr_name]
+            )
+        return not error_messages
+
+    def _attr_data_by_names(self):
+        """Input/stored values of all attributes, None if not set -> dict."""
+        data = dict.fromkeys(self._schema.attr_names)
+        data.update(self._data)
+        return data
+
+    def _store_validated(self, values_to_store):
+        """Store values of valid attributes by names."""
+        errors = self._errors
+        if errors:
+            for attr_name in values_to_store:
+                errors.pop(attr_name, None)
+        self._data.update(values_to_store)
+
+    def _attrs_to_validate(self):
+        """Names of attributes to validate on next validation -> iterable."""
         yet_to_validate = self._yet_to_validate
-        yet_to_validate.update(set(self.errors))
-        for attr_name in yet_to_validate:
-            attr_is_valid, value_to_store = self._validate_attr_data(attr_name)
+        if self.revalidate_errors:
+            attributes = self._schema.attributes
+            yet_to_validate.update(
+                name for name in self._errors if name in attributes
+            )
+        if self.lazy_validation:
+            # Hand pending attributes over to the validation,
+            # so that reads from validation hooks do not validate them again.
+            self._yet_to_validate = set()
+        return yet_to_validate
+
+    def _clear_yet_to_validate(self):
+        self._yet_to_validate.clear()
+        if self.lazy_validation:
+            self._summary_stale = False
+
+    def _checks(self):
+        """
+        Checks of attributes & validation hooks -> (check_attr, check_hook).
+
+        Reporting to observers of froshki.instrument if any.
+        """
+        if _validation_observers:
+            return instrument.observed_checks(self, _validation_observers)
+        return self._validate_attr_data, self._handle_validation_hook
+
+    def _validate_fail_fast(self):
+        if not self._kept_errors_validity():
+            return False
+        check_attr, check_hook = self._checks()
+        attrs_to_validate = frozenset(self._attrs_to_validate())
+        self._clear_yet_to_validate()
+        validated_attrs = []
+        for attr_name in self._schema.validation_order:
+            if attr_name not in attrs_to_validate:
+                continue
+            attr_is_valid, value_to_store = check_attr(attr_name)
             self._set_attr_validation_data(
                 attr_name, attr_is_valid, value_to_store
             )
-            is_valid &= attr_is_valid
-        for validator_name in self._extra_validators:
-            is_valid &= self._handle_validation_hook(validator_name)
-        self._yet_to_validate.clear()
+            validated_attrs.append(attr_name)
+            if not attr_is_valid:
+                self._mark_yet_to_validate(
+                    attrs_to_validate.difference(validated_attrs)
+                )
+                for validated_attr in validated_attrs:
+                    self._drop_hook_results(validated_attr)
+                # Hooks without reusable results are to run again.
+                hook_results = self._hook_results or {}
+                self._forget_hooks([
+                    validator_name
+                    for validator_name in self._schema.extra_validators
+                    if validator_name not in hook_results
+                ])
+                return False
+        hooks_to_validate = self._hooks_to_validate(validated_attrs)
+        if not self._reused_hooks_validity(validated_attrs):
+            self._forget_hooks(hooks_to_validate)
+            return False
+        for index, validator_name in enumerate(hooks_to_validate):
+            if not check_hook(validator_name):
+                self._forget_hooks(hooks_to_validate[index + 1:])
+                return False
+        return True
+
+    def _validate_partially(self, keys, fail_fast=False, settle=False):
+        """
+        Validate attributes of `keys` and hooks depending on them -> boolean.
+
+        With `settle`, the other attributes are not left to validate.
+        """
+        attr_names, validator_names = _partial_plan(self._schema, keys)
+        check_attr, check_hook = self._checks()
+        attrs_to_validate = self._pending_attrs(attr_names)
+        if settle:
+            self._clear_yet_to_validate()
+        else:
+            self._discard_yet_to_validate(attrs_to_validate)
+        for index, attr_name in enumerate(attrs_to_validate):
+            attr_is_valid, value_to_store = check_attr(attr_name)
+            self._set_attr_validation_data(
+                attr_name, attr_is_valid, value_to_store
+            )
+            if fail_fast and not attr_is_valid:
+                self._mark_yet_to_validate(attrs_to_validate[index + 1:])
+                for validated_attr in attrs_to_validate[:index + 1]:
+                    self._drop_hook_results(validated_attr)
+                self._forget_hooks(
+                    self._stale_hooks(validator_names, attrs_to_validate)
+                )
+                return False
+        errors = self._errors
+        is_valid = not (errors and any(name in errors for name in attr_names))
+        if fail_fast and not is_valid:
+            return False
+        stale_hooks = self._stale_hooks(validator_names, attrs_to_validate)
+        hook_results = self._hook_results or {}
+        for index, validator_name in enumerate(validator_names):
+            if validator_name in stale_hooks:
+                hook_is_valid = check_hook(validator_name)
+            else:
+                hook_is_valid = hook_results[validator_name]
+            is_valid &= hook_is_valid
+            if fail_fast and not hook_is_valid:
+                self._forget_hooks(
+                    name for name in validator_names[index + 1:]
+                    if name in stale_hooks
+                )
+                return False
         return is_valid
 
+    def _stale_hooks(self, validator_names, validated_attrs):
+        """
+        Validation hooks among `validator_names` to run again -> list,
+        i.e. ones without last results or depending on `validated_attrs`.
+        """
+        hook_results = self._hook_results or {}
+        hook_dependencies = self._schema.hook_dependencies
+        return [
+            validator_name for validator_name in validator_names
+            if validator_name not in hook_results
+            or not hook_dependencies[validator_name].isdisjoint(validated_attrs)
+        ]
+
+    def _supplied_attrs(self):
+        """Names of attributes given values -> iterable."""
+        return self._data
+
+    def _pending_attrs(self, attr_names):
+        """Attributes among `attr_names` to validate on next validation -> list."""
+        yet_to_validate = self._yet_to_validate
+        errors = self._errors if self.revalidate_errors else None
+        return [
+            attr_name for attr_name in attr_names
+            if attr_name in yet_to_validate or (errors and attr_name in errors)
+        ]
+
+    def _discard_yet_to_validate(self, attr_names):
+        self._yet_to_validate.difference_update(attr_names)
+
+    def _mark_yet_to_validate(self, attr_names):
+        self._yet_to_validate.update(attr_names)
+
+    def _drop_hook_results(self, attr_name):
+        """Forget results of validation hooks depending on the attribute."""
+        hook_results = self._hook_results
+        if hook_results:
+            dependencies = self._schema.hook_dependencies
+            for validator_name in list(hook_results):
+                if attr_name in dependencies[validator_name]:
+                    del hook_results[validator_name]
+
+    def _forget_hooks(self, validator_names):
+        """Forget results & error messages of validation hooks left unchecked."""
+        hook_results = self._hook_results
+        for validator_name in validator_names:
+            if hook_results:
+                hook_results.pop(validator_name, None)
+            self._pop_error(validator_name)
+
+    def _validate_lazily(self, attr_name):
+        """Validate an attribute on access, if it is yet to validate."""
+        yet_to_validate = self._yet_to_validate
+        if attr_name not in yet_to_validate:
+            return
+        attr_is_valid, value_to_store = self._validate_attr_data(attr_name)
+        self._set_attr_validation_data(
+            attr_name, attr_is_valid, value_to_store
+        )
+        yet_to_validate.discard(attr_name)
+        # Validation hooks depending on it are to run again.
+        self._summary_stale = True
+        self._drop_hook_results(attr_name)
+
+    def _ensure_validated(self):
+        if self._yet_to_validate or self._summary_stale:
+            self.validate()
+
+    def _kept_errors_validity(self):
+        """Validity of attribute errors kept without revalidation -> boolean."""
+        errors = self._errors
+        if self.revalidate_errors or not errors:
+            return True
+        attributes = self._schema.attributes
+        return not any(name in attributes for name in errors)
+
     def _validate_attr_data(self, attr_name):
-        attr_obj = getattr(self.__class__, attr_name)
+        schema = self._schema
         attr_data = self._data.get(attr_name, None)
-        if attr_obj.nullable and attr_data is None:
+        if attr_data is None and attr_name in schema.nullable_attrs:
             return True, attr_data
-        return attr_obj._validate(attr_data)
+        return schema.attributes[attr_name]._validate(attr_data)
 
     def _set_attr_validation_data(self, attr_name,
                                   attr_is_valid, value_to_store):
@@ -368,12 +1260,901 @@ class Froshki(object):
         else:
             self._errors[attr_name] = value_to_store
 
+    def _validate_hooks(self, validated_attrs):
+        is_valid = self._reused_hooks_validity(validated_attrs)
+        for validator_name in self._hooks_to_validate(validated_attrs):
+            is_valid &= self._handle_validation_hook(validator_name)
+        return is_valid
+
+    def _reused_hooks_validity(self, validated_attrs):
+        is_valid = True
+        hook_results = self._hook_results
+        if hook_results:
+            dependencies = self._schema.hook_dependencies
+            for validator_name in hook_results:
+                depends = dependencies.get(validator_name)
+                if depends is not None and depends.isdisjoint(validated_attrs):
+                    is_valid &= hook_results[validator_name]
+        return is_valid
+
+    def _hooks_to_validate(self, validated_attrs):
+        """
+        Names of validation hooks to run -> list.
+
+        Hooks with dependencies are skipped when none of them are validated,
+        reusing their last results in Froshki._hook_results.
+        """
+        schema = self._schema
+        hook_dependencies = schema.hook_dependencies
+        hook_results = self._hook_results
+        if not hook_dependencies or hook_results is None:
+            return schema.extra_validators
+        hooks_to_validate = []
+        for validator_name in schema.extra_validators:
+            depends = hook_dependencies.get(validator_name)
+            if (depends is None or validator_name not in hook_results
+                    or not depends.isdisjoint(validated_attrs)):
+                hooks_to_validate.append(validator_name)
+        return hooks_to_validate
+
     def _handle_validation_hook(self, validator_name):
-        self._errors.pop(validator_name, None)
-        validator = getattr(self, validator_name)
+        validator = self._schema.hooks[validator_name]
         is_valid = validator.validate(
             validator_name, self
         )
-        if not is_valid and validator.error is not None:
-            self._errors[validator_name] = validator.error
+        self._set_hook_validation_data(validator_name, is_valid)
+        return is_valid
+
+    def _set_hook_validation_data(self, validator_name, hook_is_valid):
+        schema = self._schema
+        if validator_name in schema.hook_dependencies:
+            if self._hook_results is None:
+                self._hook_results = {}
+            self._hook_results[validator_name] = hook_is_valid
+        validator = schema.hooks[validator_name]
+        if not hook_is_valid and validator.error is not None:
+            self._set_error(validator_name, validator.error)
+        else:
+            self._pop_error(validator_name)
+
+    def _set_error(self, name, message):
+        self._errors[name] = message
+
+    def _pop_error(self, name):
+        self._errors.pop(name, None)
+
+    def avalidate(self, concurrency=None, only=None):
+        """
+        Asynchronous variant of Froshki.validate -> awaitable of boolean.
+
+        Accepts coroutine Attribute.transform/validate and validation hooks,
+        and runs them concurrently, up to `concurrency` at once if given.
+        `only` is handled as Froshki.validate does, without fail-fast mode.
+        See froshki.aio.validate_async for details.
+        """
+        aio = _aio or _import_aio()
+        return aio.validate_async(self, concurrency=concurrency, only=only)
+
+    @classmethod
+    def json_schema(klass):
+        """
+        JSON Schema of the attribute sources of the class -> dict.
+
+        Built from attributes, their nullability, key aliases & defaults,
+        and Attribute.json_schema of each. Cached per class schema,
+        the result is not to be modified.
+        Inputs rejected by the JSON Schema are invalid, but ones accepted
+        may still fail validation. See froshki.json_schema for details.
+        """
+        schema = klass.get_schema()
+        if schema.json_schema is None:
+            from .json_schema import model_json_schema
+            schema.json_schema = model_json_schema(klass)
+        return schema.json_schema
+
+    def dumps(self, by_alias=False, format='json'):
+        """
+        Serialize attribute values in schema order -> str (or bytes).
+
+        Values are encoded with Attribute.encode, and keyed by
+        key aliases if `by_alias`. `format` is 'json' or 'msgpack'
+        (requires msgpack). See froshki.codec for details.
+        """
+        return codec.dumps(self, by_alias=by_alias, format=format)
+
+    @classmethod
+    def dump_many(klass, instances, by_alias=False, format='json'):
+        """
+        Serialize many instances as a sequence -> str (or bytes).
+
+        Same as Froshki.dumps, with a single encoder call for all instances.
+        """
+        return codec.dump_many(instances, by_alias=by_alias, format=format)
+
+    @classmethod
+    def from_json(klass, raw, ignore_unknown_keys=None):
+        """
+        Instantiate from a JSON object in str or bytes -> Froshki object.
+
+        With `ignore_unknown_keys`, only attribute names & aliases are looked up
+        in the decoded object, instead of iterating over all of its keys.
+        See froshki.codec for details.
+        """
+        return codec.from_json(
+            klass, raw, ignore_unknown_keys=ignore_unknown_keys,
+        )
+
+    @classmethod
+    def iter_json_lines(klass, lines, ignore_unknown_keys=None):
+        """
+        Instantiate from JSON Lines -> generator of Froshki objects.
+
+        `lines` may be a file object or any iterable of str or bytes,
+        each parsed as Froshki.from_json does. Blank lines are skipped.
+        """
+        return codec.iter_json_lines(
+            klass, lines, ignore_unknown_keys=ignore_unknown_keys,
+        )
+
+    @classmethod
+    def validate_many(klass, sources, ignore_unknown_keys=None):
+        """
+        Validate many attribute sources at once -> (records, errors).
+
+        `records` is the list of validated data of valid sources, in input order,
+        and `errors` maps indexes of invalid sources to their error messages
+        (empty if only validation hooks without error messages failed).
+        Attributes are validated column by column with Attribute._validate_batch,
+        without instantiating Froshki objects except for validation hooks.
+        Sources of partial models are validated as Froshki.partial_validation.
+        Example usage:
+        >>> class Download(Froshki):
+        ...     resource_id = Attribute()
+        ...     filetype = Attribute()
+        ...     @validation_hook.extend(error='pdf only')
+        ...     def pdf_only(self):
+        ...         return self.filetype == 'pdf'
+        >>>
+        >>> records, errors = Download.validate_many([
+        ...     {'resource_id': 1, 'filetype': 'pdf'},
+        ...     {'resource_id': 2, 'filetype': 'txt'},
+        ... ])
+        >>> records
+        [{'resource_id': 1, 'filetype': 'pdf'}]
+        >>> errors
+        {1: {'pdf_only': 'pdf only'}}
+        """
+        rows, row_errors, validities = klass._validate_rows(
+            sources, ignore_unknown_keys,
+        )
+        records = []
+        invalid = {}
+        for index, row in enumerate(rows):
+            if validities[index]:
+                records.append(row)
+            else:
+                invalid[index] = row_errors[index]
+        return records, invalid
+
+    @classmethod
+    def iter_validate(klass, sources, chunk_size=64, stop_on_error=False,
+                      drop_invalid=False, ignore_unknown_keys=None):
+        """
+        Validate attribute sources lazily -> generator of (index, data, errors).
+
+        `sources` may be any (unbounded) iterable, which is consumed and validated
+        by `chunk_size` items as Froshki.validate_many does,
+        so memory usage does not grow with the length of the input.
+        With `stop_on_error`, iteration stops after the first invalid source,
+        and with `drop_invalid` invalid sources are not yielded.
+        Raises ValueError unless `chunk_size` is positive.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        return klass._iter_validate(
+            sources, chunk_size, stop_on_error, drop_invalid,
+            ignore_unknown_keys,
+        )
+
+    @classmethod
+    def _iter_validate(klass, sources, chunk_size, stop_on_error,
+                       drop_invalid, ignore_unknown_keys):
+        sources = iter(sources)
+        offset = 0
+        while True:
+            chunk = list(itertools.islice(sources, chunk_size))
+            if not chunk:
+                return
+            rows, row_errors, validities = klass._validate_rows(
+                chunk, ignore_unknown_keys,
+            )
+            for index, row in enumerate(rows):
+                is_valid = validities[index]
+                if is_valid or not drop_invalid:
+                    yield offset + index, row, row_errors[index]
+                if not is_valid and stop_on_error:
+                    return
+            offset += len(rows)
+
+    @classmethod
+    def validate_columns(klass, columns, ignore_unknown_keys=None):
+        """
+        Validate column-oriented sources -> (columns, mask, errors).
+
+        `columns` maps attribute names or aliases to sequences of equal length,
+        e.g. lists or NumPy arrays, and each attribute is validated over its
+        whole column with Attribute._validate_batch. Attributes can vectorize
+        it by overriding transform_batch/validate_batch, otherwise values are
+        validated one by one. Missing columns are filled with defaults or None,
+        or left out for partial models (see Froshki.partial_validation).
+        Returns validated columns by attribute names (values at invalid rows
+        are not to be used), a validity mask of rows, and `errors` mapping
+        attribute & hook names to {row index: error message} of failures.
+        The mask is a NumPy boolean array if any column is a NumPy array,
+        otherwise a list.
+        Example usage:
+        >>> class Download(Froshki):
+        ...     resource_id = Attribute()
+        ...     filetype = Attribute(key_alias='type')
+        ...     @validation_hook.extend(error='pdf only')
+        ...     def pdf_only(self):
+        ...         return self.filetype == 'pdf'
+        >>>
+        >>> columns, mask, errors = Download.validate_columns(
+        ...     {'resource_id': [1, 2], 'type': ['pdf', 'txt']}
+        ... )
+        >>> list(mask)
+        [True, False]
+        >>> errors
+        {'pdf_only': {1: 'pdf only'}}
+        """
+        schema = klass.get_schema()
+        _check_sync(schema)
+        if ignore_unknown_keys is None:
+            ignore_unknown_keys = klass.ignore_unknown_keys
+        source_columns = {}
+        length = None
+        key_map = schema.key_map
+        for key in _source_keys(key_map, columns, ignore_unknown_keys):
+            name = key_map.get(key)
+            if name is None:
+                if ignore_unknown_keys:
+                    continue
+                raise TypeError(
+                    "'{klass}' has no attirbute {attr}".format(
+                        klass=klass.__name__,
+                        attr=key,
+                    )
+                )
+            column = columns[key]
+            if length is None:
+                length = len(column)
+            elif len(column) != length:
+                raise ValueError(
+                    'column {0} has length {1}, not {2}'.format(
+                        key, len(column), length,
+                    )
+                )
+            source_columns[name] = column
+        if length is None:
+            length = 0
+        attr_names = schema.attr_names
+        validator_names = schema.extra_validators
+        if klass.partial_validation:
+            # Only the given columns, as Froshki.partial_validation.
+            validator_names = _partial_plan(schema, source_columns)[1]
+            attr_names = tuple(
+                name for name in attr_names if name in source_columns
+            )
+        # NumPy is in use by the caller if any column is a NumPy array.
+        numpy = sys.modules.get('numpy')
+        if numpy is not None and not any(
+                isinstance(column, numpy.ndarray)
+                for column in source_columns.values()):
+            numpy = None
+        if numpy is not None:
+            mask = numpy.ones(length, dtype=bool)
+        else:
+            mask = [True] * length
+        defaults = klass._source_data(schema, {}, False)
+        for attr_name in attr_names:
+            if attr_name not in source_columns:
+                source_columns[attr_name] = [defaults.get(attr_name)] * length
+        validated_columns = {}
+        errors = {}
+        for attr_name in attr_names:
+            validated_columns[attr_name], attr_errors = klass._validate_array(
+                schema, attr_name, source_columns[attr_name], mask, numpy,
+            )
+            if attr_errors:
+                errors[attr_name] = attr_errors
+        if validator_names:
+            klass._validate_hooks_on_columns(
+                schema, validated_columns, source_columns, length, mask, errors,
+                validator_names,
+            )
+        return validated_columns, mask, errors
+
+    @classmethod
+    def _validate_array(klass, schema, attr_name, column, mask, numpy):
+        """Validate a column, updating `mask` in place -> (values, errors)."""
+        indexes = None
+        if attr_name in schema.nullable_attrs:
+            indexes = [
+                index for index, value in enumerate(column) if value is not None
+            ]
+            if len(indexes) == len(column):
+                indexes = None
+            else:
+                column = [column[index] for index in indexes]
+        attr_obj = schema.attributes[attr_name]
+        validities, results = attr_obj._validate_batch(column)
+        errors = {}
+        if numpy is not None:
+            validities = numpy.asarray(validities, dtype=bool)
+            failures = numpy.flatnonzero(~validities).tolist()
+        else:
+            failures = [
+                index for index, attr_is_valid in enumerate(validities)
+                if not attr_is_valid
+            ]
+        for index in failures:
+            row_index = index if indexes is None else indexes[index]
+            errors[row_index] = results[index]
+            mask[row_index] = False
+        if indexes is not None:
+            # Fill rows skipped as null.
+            values = [None] * len(mask)
+            for index, row_index in enumerate(indexes):
+                values[row_index] = results[index]
+            results = values
+        return results, errors
+
+    @classmethod
+    def _validate_hooks_on_columns(klass, schema, columns, source_columns,
+                                   length, mask, errors, validator_names):
+        for index in range(length):
+            # Invalid attributes are seen as input, as on Froshki instances.
+            data = dict(
+                (attr_name,
+                 source_columns[attr_name][index]
+                 if index in errors.get(attr_name, ())
+                 else columns[attr_name][index])
+                for attr_name in columns
+            )
+            row_errors = {}
+            if not klass._validate_hooks_on_data(
+                    schema, data, row_errors, validator_names):
+                mask[index] = False
+            for validator_name in row_errors:
+                errors.setdefault(validator_name, {})[index] = (
+                    row_errors[validator_name]
+                )
+
+    @classmethod
+    def _validate_rows(klass, sources, ignore_unknown_keys=None):
+        """
+        Validate sources without instantiation
+        -> (data_rows, error_rows, validities).
+        """
+        schema = klass.get_schema()
+        if ignore_unknown_keys is None:
+            ignore_unknown_keys = klass.ignore_unknown_keys
+        rows = [
+            klass._source_data(schema, source, ignore_unknown_keys)
+            for source in sources
+        ]
+        row_errors = [{} for row in rows]
+        validities = klass._validate_data_rows(schema, rows, row_errors)
+        return rows, row_errors, validities
+
+    @classmethod
+    def _validate_data_rows(klass, schema, rows, row_errors):
+        """
+        Validate attribute data rows in place -> validities.
+
+        Rows of partial models are validated as Froshki.partial_validation,
+        only on attributes given values.
+        """
+        _check_sync(schema)
+        partial = klass.partial_validation
+        for attr_name in schema.attr_names:
+            klass._validate_column(
+                schema, attr_name, rows, row_errors, partial=partial,
+            )
+        validities = [not errors for errors in row_errors]
+        if schema.extra_validators:
+            validator_names = schema.extra_validators
+            for index, (row, errors) in enumerate(zip(rows, row_errors)):
+                if partial:
+                    validator_names = _partial_plan(schema, row)[1]
+                # Hooks may fail without error messages.
+                if not klass._validate_hooks_on_data(
+                        schema, row, errors, validator_names):
+                    validities[index] = False
+        return validities
+
+    @classmethod
+    def _source_data(klass, schema, source, ignore_unknown_keys):
+        """Build attribute data from defaults & source, as __init__ does."""
+        key_map = schema.key_map
+        data = {}
+        for attr_source, ignore_unknown in (
+                (klass.default_values, False),
+                (source, ignore_unknown_keys)):
+            for key in _source_keys(key_map, attr_source, ignore_unknown):
+                name = key_map.get(key)
+                if name is not None:
+                    data[name] = attr_source[key]
+                elif not ignore_unknown:
+                    raise TypeError(
+                        "'{klass}' has no attirbute {attr}".format(
+                            klass=klass.__name__,
+                            attr=key,
+                        )
+                    )
+        return data
+
+    @classmethod
+    def _validate_column(klass, schema, attr_name, rows, row_errors,
+                         partial=False):
+        """
+        Validate an attribute over data rows in place.
+
+        With `partial`, rows without the attribute are skipped.
+        """
+        nullable = attr_name in schema.nullable_attrs
+        indexes = []
+        for index, row in enumerate(rows):
+            if partial and attr_name not in row:
+                continue
+            if nullable and row.get(attr_name, None) is None:
+                row[attr_name] = None
+            else:
+                indexes.append(index)
+        input_values = [rows[index].get(attr_name, None) for index in indexes]
+        if not input_values:
+            return
+        attr_obj = schema.attributes[attr_name]
+        validities, results = attr_obj._validate_batch(input_values)
+        for index, attr_is_valid, result in zip(indexes, validities, results):
+            if attr_is_valid:
+                rows[index][attr_name] = result
+            else:
+                row_errors[index][attr_name] = result
+
+    @classmethod
+    def _validate_hooks_on_data(klass, schema, data, errors,
+                                validator_names):
+        """Run validation hooks on a bare instance wrapping `data` -> boolean."""
+        froshki = object.__new__(klass)
+        froshki._data = data
+        froshki._errors = errors
+        froshki._yet_to_validate = set()
+        is_valid = True
+        for validator_name in validator_names:
+            is_valid &= froshki._handle_validation_hook(validator_name)
+        return is_valid
+
+
+# Marks attribute values yet to be set in CompactFroshki._values.
+_MISSING = object()
+
+
+# Froshki is slotted for compact subclasses,
+# so instances of Froshki itself are created with __dict__ by this subclass.
+_BareFroshki = FroshkiMeta('Froshki', (Froshki,), {'__module__': __name__})
+
+
+class CompactFroshki(Froshki):
+    """
+    Froshki base class with compact instance storage.
+
+    Instances have no __dict__, attribute values are stored in a list indexed
+    by the attribute positions of the schema, and containers for errors and
+    attributes yet to validate are allocated only when needed.
+    Subclasses get empty __slots__ unless they define ones, so attribute mixins
+    should also define __slots__ to keep instances compact.
+    Attributes must not be added to or removed from compact models
+    after instantiation, and `Froshki.generate_methods` & `Froshki.lazy_validation`
+    are not supported, raising TypeError on schema compilation.
+    """
+
+    __slots__ = ('_values', '_errors', '_yet_to_validate', '_hook_results')
+
+    _compact_storage = True
+
+    @classmethod
+    def _compile_schema(klass):
+        for option in ('generate_methods', 'lazy_validation'):
+            if getattr(klass, option):
+                raise TypeError(
+                    "'{klass}' is compact, not supporting {option}".format(
+                        klass=klass.__name__,
+                        option=option,
+                    )
+                )
+        return super(CompactFroshki, klass)._compile_schema()
+
+    def __init__(self, source=None, ignore_unknown_keys=None,
+                 **init_attrs_by_kws):
+        self._values = [_MISSING] * len(self._schema.attr_names)
+        self._errors = None
+        # All attributes are to be validated.
+        self._yet_to_validate = None
+        self._hook_results = None
+        if ignore_unknown_keys is None:
+            ignore_unknown_keys = self.ignore_unknown_keys
+        self._source_attr_defaults()
+        if source is not None:
+            self._init_attrs(
+                source,
+                ignore_unknown_keys=ignore_unknown_keys,
+            )
+        self._init_attrs(init_attrs_by_kws)
+
+    def reset(self, source=None, ignore_unknown_keys=None,
+              **init_attrs_by_kws):
+        values = self._values
+        values[:] = itertools.repeat(_MISSING, len(values))
+        if self._errors:
+            self._errors.clear()
+        self._yet_to_validate = None
+        if self._hook_results:
+            self._hook_results.clear()
+        if ignore_unknown_keys is None:
+            ignore_unknown_keys = self.ignore_unknown_keys
+        self._source_attr_defaults()
+        if source is not None:
+            self._init_attrs(
+                source,
+                ignore_unknown_keys=ignore_unknown_keys,
+            )
+        if init_attrs_by_kws:
+            self._init_attrs(init_attrs_by_kws)
+        return self
+
+    @property
+    def errors(self):
+        return dict(self._errors or ())
+
+    @property
+    def data(self):
+        return dict(
+            (name, value)
+            for name, value in zip(self._schema.attr_names, self._values)
+            if value is not _MISSING
+        )
+
+    @property
+    def errors_view(self):
+        if self._errors is None:
+            self._errors = {}
+        return _mapping_view(self._errors)
+
+    @property
+    def data_view(self):
+        return CompactDataView(self)
+
+    def _attr_values(self):
+        return CompactDataView(self)
+
+    def _set_attr_data(self, name, input_value,
+                       mark_as_unvalidated=True):
+        self._values[self._schema.attr_indexes[name]] = input_value
+        if mark_as_unvalidated and self._yet_to_validate is not None:
+            if not self._yet_to_validate:
+                self._yet_to_validate = set()
+            self._yet_to_validate.add(name)
+
+    def _get_attr_data(self, name):
+        value = self._values[self._schema.attr_indexes[name]]
+        if value is _MISSING:
+            return None
+        return value
+
+    def _set_error(self, name, message):
+        if self._errors is None:
+            self._errors = {}
+        self._errors[name] = message
+
+    def _pop_error(self, name):
+        if self._errors:
+            self._errors.pop(name, None)
+
+    def _attrs_to_validate(self):
+        """Names of attributes to validate on next validation -> iterable."""
+        attr_names = self._schema.attr_names
+        yet_to_validate = self._yet_to_validate
+        errors = self._errors
+        if yet_to_validate is None:
+            return attr_names
+        if not self.revalidate_errors:
+            errors = None
+        return [
+            attr_name for attr_name in attr_names
+            if attr_name in yet_to_validate or (errors and attr_name in errors)
+        ]
+
+    def _clear_yet_to_validate(self):
+        # Nothing left to validate, without allocating an empty set.
+        self._yet_to_validate = ()
+
+    def _mark_yet_to_validate(self, attr_names):
+        yet_to_validate = self._yet_to_validate
+        if not attr_names or yet_to_validate is None:
+            return
+        if yet_to_validate:
+            yet_to_validate.update(attr_names)
+        else:
+            self._yet_to_validate = set(attr_names)
+
+    def _attr_data_by_names(self):
+        return dict(
+            (attr_name, None if value is _MISSING else value)
+            for attr_name, value in zip(self._schema.attr_names, self._values)
+        )
+
+    def _store_validated(self, values_to_store):
+        errors = self._errors
+        attr_indexes = self._schema.attr_indexes
+        values = self._values
+        for attr_name in values_to_store:
+            if errors:
+                errors.pop(attr_name, None)
+            values[attr_indexes[attr_name]] = values_to_store[attr_name]
+
+    def _supplied_attrs(self):
+        return [
+            attr_name for attr_name, value
+            in zip(self._schema.attr_names, self._values)
+            if value is not _MISSING
+        ]
+
+    def _pending_attrs(self, attr_names):
+        yet_to_validate = self._yet_to_validate
+        if yet_to_validate is None:
+            return list(attr_names)
+        errors = self._errors if self.revalidate_errors else None
+        return [
+            attr_name for attr_name in attr_names
+            if attr_name in yet_to_validate or (errors and attr_name in errors)
+        ]
+
+    def _discard_yet_to_validate(self, attr_names):
+        yet_to_validate = self._yet_to_validate
+        if yet_to_validate is None:
+            self._yet_to_validate = set(
+                self._schema.attr_names
+            ).difference(attr_names)
+        elif yet_to_validate:
+            yet_to_validate.difference_update(attr_names)
+
+    def _validate_attr_data(self, attr_name):
+        schema = self._schema
+        attr_data = self._get_attr_data(attr_name)
+        if attr_data is None and attr_name in schema.nullable_attrs:
+            return True, attr_data
+        return schema.attributes[attr_name]._validate(attr_data)
+
+    def _set_attr_validation_data(self, attr_name,
+                                  attr_is_valid, value_to_store):
+        if attr_is_valid:
+            if self._errors:
+                self._errors.pop(attr_name, None)
+            self._values[self._schema.attr_indexes[attr_name]] = value_to_store
+        else:
+            self._set_error(attr_name, value_to_store)
+
+    @classmethod
+    def _validate_hooks_on_data(klass, schema, data, errors,
+                                validator_names):
+        """Run validation hooks on a bare instance wrapping `data` -> boolean."""
+        froshki = object.__new__(klass)
+        froshki._values = [
+            data.get(name, _MISSING) for name in schema.attr_names
+        ]
+        froshki._errors = errors
+        froshki._yet_to_validate = ()
+        froshki._hook_results = None
+        is_valid = True
+        for validator_name in validator_names:
+            is_valid &= froshki._handle_validation_hook(validator_name)
         return is_valid
+
+
+class CompactDataView(Mapping):
+    """
+    Read-only view of the attribute values of a CompactFroshki object.
+    """
+
+    __slots__ = ('_froshki',)
+
+    def __init__(self, froshki):
+        self._froshki = froshki
+
+    def __getitem__(self, name):
+        froshki = self._froshki
+        index = froshki._schema.attr_indexes.get(name)
+        if index is None or froshki._values[index] is _MISSING:
+            raise KeyError(name)
+        return froshki._values[index]
+
+    def __iter__(self):
+        froshki = self._froshki
+        for name, value in zip(froshki._schema.attr_names, froshki._values):
+            if value is not _MISSING:
+                yield name
+
+    def __len__(self):
+        return sum(
+            1 for value in self._froshki._values if value is not _MISSING
+        )
+
+    def copy(self):
+        return self._froshki.data
+
+
+class ModelAttribute(Attribute):
+    """
+    Attribute holding a nested Froshki model, from a mapping source.
+
+    Sources are validated against the cached schema of the model,
+    without instantiation unless `as_model`, storing validated data dicts.
+    Error messages are dicts of nested errors by attribute names.
+    Usage:
+    >>> class ZipCode(Attribute):
+    ...     @classmethod
+    ...     def validate(klass, input_value):
+    ...         if input_value.isdigit():
+    ...             return True, input_value
+    ...         return False, 'invalid zip code'
+    >>> class Address(Froshki):
+    ...     city = Attribute()
+    ...     zip_code = ZipCode()
+    >>> class Order(Froshki):
+    ...     item_id = Attribute()
+    ...     address = ModelAttribute(Address)
+    >>>
+    >>> order = Order(item_id=3, address={'city': 'Tokyo', 'zip_code': 'x'})
+    >>> order.validate()
+    False
+    >>> order.errors
+    {'address': {'zip_code': 'invalid zip code'}}
+    """
+
+    def __init__(self, model, as_model=False, **kwargs):
+        Attribute.__init__(self, **kwargs)
+        self.model = model
+        self.as_model = as_model
+
+    def _validate(self, input_value):
+        validities, results = self._validate_batch([input_value])
+        return validities[0], results[0]
+
+    def _validate_batch(self, input_values):
+        return _validate_nested_sources(self.model, input_values, self.as_model)
+
+    def encode(self, value):
+        if value is None:
+            return value
+        if self.as_model:
+            return codec.to_primitive(value)
+        return self._encode_data(value)
+
+    def _encode_data(self, data):
+        plan = codec.encoding_plan(self.model.get_schema())
+        if plan.is_identity:
+            return data
+        return plan.encode(data)
+
+    def json_schema(self):
+        from .json_schema import object_schema
+        return object_schema(self.model)
+
+
+class ListOf(ModelAttribute):
+    """
+    Attribute holding a list of nested Froshki models, from a list of mappings.
+
+    Elements of all the lists are validated at once, as ModelAttribute does.
+    Error messages are dicts of nested errors by element indexes.
+    Usage:
+    >>> class OrderItem(Froshki):
+    ...     item_id = Attribute()
+    >>> class Order(Froshki):
+    ...     items = ListOf(OrderItem)
+    >>>
+    >>> order = Order(items=[{'item_id': 1}, {'item_id': 2, 'volume': 3}])
+    >>> order.validate()
+    False
+    >>> order.errors
+    {'items': {1: {'volume': 'unknown attribute'}}}
+    """
+
+    def _validate_batch(self, input_values):
+        elements = []
+        for input_value in input_values:
+            if isinstance(input_value, (list, tuple)):
+                elements.extend(input_value)
+        element_validities, element_results = _validate_nested_sources(
+            self.model, elements, self.as_model,
+        )
+        validities = []
+        results = []
+        offset = 0
+        for input_value in input_values:
+            if not isinstance(input_value, (list, tuple)):
+                validities.append(False)
+                results.append('data conversion error: {}'.format(input_value))
+                continue
+            end = offset + len(input_value)
+            errors = dict(
+                (index, element_results[offset + index])
+                for index in range(len(input_value))
+                if not element_validities[offset + index]
+            )
+            if errors:
+                validities.append(False)
+                results.append(errors)
+            else:
+                validities.append(True)
+                results.append(element_results[offset:end])
+            offset = end
+        return validities, results
+
+    def encode(self, value):
+        if value is None:
+            return value
+        if self.as_model:
+            to_primitive = codec.to_primitive
+            return [to_primitive(element) for element in value]
+        return [self._encode_data(element) for element in value]
+
+    def json_schema(self):
+        return dict(type='array', items=ModelAttribute.json_schema(self))
+
+
+def _validate_nested_sources(model, sources, as_model=False):
+    """
+    Validate sources of a nested model -> (validities, data_or_errors).
+    """
+    schema = model.get_schema()
+    key_map = schema.key_map
+    ignore_unknown_keys = model.ignore_unknown_keys
+    results = [None] * len(sources)
+    indexes = []
+    rows = []
+    for index, source in enumerate(sources):
+        if not isinstance(source, Mapping):
+            results[index] = 'data conversion error: {}'.format(source)
+            continue
+        if not ignore_unknown_keys:
+            unknown_keys = [key for key in source if key not in key_map]
+            if unknown_keys:
+                results[index] = dict(
+                    (key, 'unknown attribute') for key in unknown_keys
+                )
+                continue
+        rows.append(model._source_data(schema, source, ignore_unknown_keys))
+        indexes.append(index)
+    validities = [False] * len(sources)
+    row_errors = [{} for row in rows]
+    row_validities = model._validate_data_rows(schema, rows, row_errors)
+    for index, row, errors, row_is_valid in zip(
+            indexes, rows, row_errors, row_validities):
+        validities[index] = row_is_valid
+        if not row_is_valid:
+            results[index] = errors
+        elif as_model:
+            froshki = model(source=row)
+            # Already validated.
+            froshki._clear_yet_to_validate()
+            results[index] = froshki
+        else:
+            results[index] = row
+    return validities, results
+
+
+# Imported last, as they depend on this module.
+from . import codec, instrument
@@ -0,0 +1,111 @@
+# encoding: utf-8
+
+"""
+    froshki.parallel
+    ~~~~~~~~~~~~~~~~
+
+    Implements parallel batch validation of Froshki models
+    over a process pool.
+
+    :copyright: (c) 2013 by ymat<drowse314@gmail.com>.
+    :license: BSD, see LICENSE for more details.
+"""
+
+import importlib
+import itertools
+try:
+    from concurrent import futures
+except ImportError:
+    raise ImportError('futures is not installed')
+
+
+class ModelReference(object):
+    """
+    Picklable reference to a Froshki subclass, resolved by import path.
+
+    Models must be importable, i.e. defined at module level.
+    """
+
+    def __init__(self, model):
+        self.module = model.__module__
+        self.qualname = getattr(model, '__qualname__', model.__name__)
+        if self.resolve() is not model:
+            raise TypeError(
+                "'{model}' is not importable as {module}.{qualname}".format(
+                    model=model.__name__,
+                    module=self.module,
+                    qualname=self.qualname,
+                )
+            )
+
+    def resolve(self):
+        obj = importlib.import_module(self.module)
+        try:
+            for name in self.qualname.split('.'):
+                obj = getattr(obj, name)
+        except AttributeError:
+            return None
+        return obj
+
+
+def _validate_chunk(args):
+    model_reference, chunk, ignore_unknown_keys = args
+    model = model_reference.resolve()
+    return model._validate_rows(chunk, ignore_unknown_keys)
+
+
+def _iter_chunks(sources, chunk_size):
+    sources = iter(sources)
+    while True:
+        chunk = list(itertools.islice(sources, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_parallel(model, sources, chunk_size=1000, max_workers=None,
+                      ignore_unknown_keys=None, executor=None):
+    """
+    validate_parallel(model, sources) -> (records, errors).
+
+    Splits `sources` into chunks of `chunk_size`, validates them
+    in worker processes as `model.validate_many` does, and merges the results
+    in input order. Returns same values as Froshki.validate_many.
+    `executor` may be an existing concurrent.futures.Executor to reuse,
+    otherwise a ProcessPoolExecutor with `max_workers` is used.
+    Transformed values & error messages must be picklable.
+    Usage (`model` must be defined in an importable module):
+
+        class Download(Froshki):
+            resource_id = ResourceId()
+            filetype = Filetype()
+
+        records, errors = validate_parallel(
+            Download, read_download_rows(), chunk_size=5000,
+        )
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+    model_reference = ModelReference(model)
+    tasks = (
+        (model_reference, chunk, ignore_unknown_keys)
+        for chunk in _iter_chunks(sources, chunk_size)
+    )
+    if executor is None:
+        with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return _merge_results(executor.map(_validate_chunk, tasks))
+    return _merge_results(executor.map(_validate_chunk, tasks))
+
+
+def _merge_results(chunk_results):
+    records = []
+    invalid = {}
+    index = 0
+    for rows, row_errors, validities in chunk_results:
+        for row, errors, is_valid in zip(rows, row_errors, validities):
+            if is_valid:
+                records.append(row)
+            else:
+                invalid[index] = errors
+            index += 1
+    return records, invalid
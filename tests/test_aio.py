@@ -0,0 +1,162 @@
+# encoding: utf-8
+
+import asyncio
+import unittest
+from froshki import Froshki, CompactFroshki, validation_hook, Attribute
+
+
+class AsyncResourceId(Attribute):
+    @classmethod
+    async def transform(klass, input_value):
+        await asyncio.sleep(0)
+        return int(input_value)
+    @classmethod
+    async def validate(klass, input_value):
+        await asyncio.sleep(0)
+        if input_value in (1,5,7,9):
+            return True, input_value
+        else:
+            return False, 'resource id not found'
+
+
+class Filetype(Attribute):
+    @classmethod
+    def validate(klass, input_value):
+        if input_value in ('pdf', 'txt', 'mobi'):
+            return True, input_value
+        else:
+            return False, 'filetype unavailable'
+
+
+class TestAsyncValidation(unittest.TestCase):
+
+    def test_avalidate(self):
+
+        taken = set(['ymat'])
+
+        class Download(Froshki):
+            resource_id = AsyncResourceId()
+            filetype = Filetype()
+            user = Attribute()
+            @validation_hook.extend(error='user not found')
+            async def user_exists(self):
+                await asyncio.sleep(0)
+                return self.user in taken
+
+        download = Download(resource_id='9', filetype='pdf', user='ymat')
+        self.assertTrue(asyncio.run(download.avalidate()))
+        self.assertEqual(download.resource_id, 9)
+        download.resource_id = 'x'
+        download.filetype = 'doc'
+        download.user = 'someone'
+        self.assertFalse(asyncio.run(download.avalidate(concurrency=1)))
+        self.assertEqual(
+            download.errors,
+            {'resource_id': 'data conversion error: x',
+             'filetype': 'filetype unavailable',
+             'user_exists': 'user not found'},
+        )
+        download.resource_id = '5'
+        download.filetype = 'txt'
+        download.user = 'ymat'
+        self.assertTrue(asyncio.run(download.avalidate()))
+        self.assertEqual(download.errors, {})
+
+    def test_concurrency_limit(self):
+
+        running = []
+        peak = []
+
+        class Slow(Attribute):
+            @classmethod
+            async def validate(klass, input_value):
+                running.append(input_value)
+                peak.append(len(running))
+                await asyncio.sleep(0.01)
+                running.remove(input_value)
+                return True, input_value
+
+        class Row(CompactFroshki):
+            a = Slow()
+            b = Slow()
+            c = Slow()
+            d = Slow()
+
+        row = Row(a=1, b=2, c=3, d=4)
+        self.assertTrue(asyncio.run(row.avalidate(concurrency=2)))
+        self.assertEqual(max(peak), 2)
+        del peak[:]
+        row.a = 5
+        row.b = 6
+        row.c = 7
+        self.assertTrue(asyncio.run(row.avalidate()))
+        self.assertEqual(max(peak), 3)  # Only modified attributes.
+        self.assertEqual(row.data, {'a': 5, 'b': 6, 'c': 7, 'd': 4})
+
+    def test_cached_attribute(self):
+
+        class CachedFiletype(Filetype):
+            cache_size = 8
+
+        class Download(Froshki):
+            filetype = CachedFiletype()
+
+        for filetype in ('pdf', 'pdf', 'doc'):
+            asyncio.run(Download(filetype=filetype).avalidate())
+        info = CachedFiletype.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 2))
+
+        # Coroutines are not to be cached.
+        class CachedResourceId(AsyncResourceId):
+            cache_size = 8
+
+        class AsyncDownload(Froshki):
+            resource_id = CachedResourceId()
+
+        with self.assertRaises(TypeError):
+            AsyncDownload(resource_id='9')
+
+    def test_partial_validation(self):
+
+        class Download(Froshki):
+            resource_id = AsyncResourceId()
+            filetype = Filetype()
+            @validation_hook.extend(error='pdf only', depends=('filetype',))
+            async def pdf_only(self):
+                await asyncio.sleep(0)
+                return self.filetype == 'pdf'
+
+        patch_download = Download.partial()(filetype='pdf')
+        self.assertTrue(asyncio.run(patch_download.avalidate()))
+        self.assertEqual(patch_download.data, {'filetype': 'pdf'})
+        patch_download.filetype = 'txt'
+        self.assertFalse(asyncio.run(patch_download.avalidate()))
+        self.assertEqual(patch_download.errors, {'pdf_only': 'pdf only'})
+
+        download = Download(resource_id='x', filetype='pdf')
+        self.assertTrue(asyncio.run(download.avalidate(only=('filetype',))))
+        # The rest is left to validate.
+        self.assertFalse(asyncio.run(download.avalidate()))
+        self.assertEqual(
+            download.errors, {'resource_id': 'data conversion error: x'},
+        )
+
+    def test_sync_validation_rejected(self):
+
+        class Download(Froshki):
+            resource_id = AsyncResourceId()
+
+        class Register(CompactFroshki):
+            user = Attribute()
+            @validation_hook
+            async def unique_user(self):
+                return True
+
+        for model, source in ((Download, {'resource_id': '9'}),
+                              (Register, {'user': 'ymat'})):
+            with self.assertRaises(TypeError) as context:
+                model(source=source).validate()
+            self.assertIn('avalidate()', str(context.exception))
+            with self.assertRaises(TypeError):
+                model.validate_many([source])
+            self.assertTrue(asyncio.run(model(source=source).avalidate()))
@@ -0,0 +1,157 @@
+# encoding: utf-8
+
+import datetime
+import json
+import unittest
+from froshki import Froshki, CompactFroshki, Attribute, ModelAttribute, ListOf
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class Date(Attribute):
+    @classmethod
+    def transform(klass, input_value):
+        return datetime.datetime.strptime(input_value, '%Y-%m-%d').date()
+    @classmethod
+    def encode(klass, value):
+        return value.isoformat()
+
+
+class TestSerialization(unittest.TestCase):
+
+    def define_event(self, base):
+
+        class Event(base):
+            event_name = Attribute(key_alias='name')
+            event_date = Date(key_alias='date')
+            note = Attribute(nullable=True)
+
+        return Event
+
+    def test_dumps(self):
+
+        for base in (Froshki, CompactFroshki):
+            Event = self.define_event(base)
+            event = Event(name='PyCon JP', date='2013-09-14')
+            self.assertTrue(event.validate())
+            self.assertEqual(
+                json.loads(event.dumps()),
+                dict(event_name='PyCon JP', event_date='2013-09-14', note=None),
+            )
+            self.assertEqual(
+                json.loads(event.dumps(by_alias=True)),
+                dict(name='PyCon JP', date='2013-09-14', note=None),
+            )
+            # Unset attributes are skipped.
+            self.assertEqual(
+                Event(name='PyCon APAC').dumps(), '{"event_name": "PyCon APAC"}',
+            )
+            with self.assertRaises(ValueError):
+                event.dumps(format='yaml')
+
+    def test_dump_many(self):
+
+        for base in (Froshki, CompactFroshki):
+            Event = self.define_event(base)
+            events = [
+                Event(name='PyCon JP', date='2013-09-14'),
+                Event(name='PyCon APAC', date='2013-09-15', note='Tokyo'),
+            ]
+            for event in events:
+                event.validate()
+            self.assertEqual(
+                json.loads(Event.dump_many(events, by_alias=True)),
+                [
+                    dict(name='PyCon JP', date='2013-09-14', note=None),
+                    dict(name='PyCon APAC', date='2013-09-15', note='Tokyo'),
+                ],
+            )
+            self.assertEqual(Event.dump_many([]), '[]')
+
+    def test_nested_dumps(self):
+
+        Event = self.define_event(CompactFroshki)
+
+        for as_model in (False, True):
+
+            class Calendar(Froshki):
+                event = ModelAttribute(Event, as_model=as_model)
+                events = ListOf(Event, as_model=as_model)
+                holiday = ModelAttribute(Event, nullable=True)
+
+            calendar = Calendar(
+                event={'name': 'PyCon JP', 'date': '2013-09-14'},
+                events=[{'name': 'PyCon APAC', 'date': '2013-09-15'}],
+            )
+            self.assertTrue(calendar.validate())
+            # Nested values are encoded by their attributes.
+            self.assertEqual(json.loads(calendar.dumps()), dict(
+                event=dict(
+                    event_name='PyCon JP', event_date='2013-09-14', note=None,
+                ),
+                events=[dict(
+                    event_name='PyCon APAC', event_date='2013-09-15', note=None,
+                )],
+                holiday=None,
+            ))
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack(self):
+
+        Event = self.define_event(Froshki)
+        event = Event(name='PyCon JP', date='2013-09-14')
+        event.validate()
+        self.assertEqual(
+            msgpack.unpackb(event.dumps(format='msgpack')),
+            dict(event_name='PyCon JP', event_date='2013-09-14', note=None),
+        )
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_from_json(self):
+
+        class Download(Froshki):
+            resource_id = Attribute(key_alias='id')
+            filetype = Attribute()
+
+        download = Download.from_json(
+            b'{"id": 9, "meta": {"tags": ["a", "}\\"]"], "n": [1, {}]},'
+            b' "filetype": "pdf", "size": -1.5e3, "ok": true}',
+            ignore_unknown_keys=True,
+        )
+        self.assertTrue(download.validate())
+        self.assertEqual(download.data, dict(resource_id=9, filetype='pdf'))
+        download = Download.from_json(u' { "filetype" : "txt" } ')
+        self.assertEqual(download.data, dict(filetype='txt'))
+        self.assertEqual(Download.from_json('{}').data, {})
+
+        with self.assertRaises(TypeError):
+            Download.from_json('{"id": 9, "meta": null}')
+        for invalid in ('[1]', '{"id": }', '{"id": 9', '{"id": 9} 1'):
+            with self.assertRaises(ValueError):
+                Download.from_json(invalid, ignore_unknown_keys=True)
+
+    def test_iter_json_lines(self):
+
+        class Download(Froshki):
+            resource_id = Attribute()
+            filetype = Attribute()
+            ignore_unknown_keys = True
+
+        lines = [
+            b'{"resource_id": 1, "filetype": "pdf", "user": {"id": 3}}\n',
+            b'\n',
+            b'{"resource_id": 2, "filetype": "txt"}\n',
+        ]
+        downloads = list(Download.iter_json_lines(lines))
+        self.assertEqual(
+            [download.data for download in downloads],
+            [
+                dict(resource_id=1, filetype='pdf'),
+                dict(resource_id=2, filetype='txt'),
+            ],
+        )
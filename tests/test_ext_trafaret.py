@@ -109,3 +109,83 @@ class TestTrafaretIntegration(unittest.TestCase):
         valid_source.pop('team_name')
         event_entry = EventEntry(source=valid_source)
         self.assertTrue(event_entry.validate())
+
+    def test_bulk_validation(self):
+
+        Volume = trafaret_attr(trafaret.Int(gt=0))
+        Name = trafaret_attr(
+            trafaret.String() >> (lambda name: name.title())
+        )
+
+        class OrderItem(Froshki):
+            bulk_validation = True
+            volume = Volume()
+            name = Name(key_alias='item_name')
+            note = trafaret_attr(trafaret.String())(nullable=True)
+
+        schema = OrderItem.get_schema()
+        self.assertIsNotNone(schema.bulk_validator)
+
+        order_item = OrderItem(volume=3, item_name='furoshiki')
+        self.assertTrue(order_item.validate())
+        self.assertEqual(
+            order_item.data, dict(volume=3, name='Furoshiki', note=None),
+        )
+
+        order_item = OrderItem(volume=0, item_name='furoshiki', note=1)
+        self.assertFalse(order_item.validate())
+        self.assertEqual(set(order_item.errors), set(['volume', 'note']))
+        self.assertEqual(
+            order_item.errors['volume'],
+            Volume.validate(0)[1],  # Same messages as per-attribute checks.
+        )
+        self.assertEqual(order_item.name, 'Furoshiki')
+        order_item.volume = 2
+        order_item.note = None
+        self.assertTrue(order_item.validate())
+
+        # Customized attributes are validated one by one.
+        class Cached(Froshki):
+            bulk_validation = True
+            volume = trafaret_attr(trafaret.Int(), cache_size=8)()
+            name = Name()
+        self.assertIsNone(Cached.get_schema().bulk_validator)
+
+    def test_json_schema(self):
+
+        class SendInquiry(Froshki):
+            user_name = trafaret_attr(trafaret.String(max_length=32))()
+            user_contact = trafaret_attr(trafaret.Email)()
+            volume = trafaret_attr(trafaret.Int(gte=1, lt=10))()
+            category = trafaret_attr(trafaret.Enum('bug', 'question'))(
+                nullable=True,
+            )
+            tags = trafaret_attr(
+                trafaret.List(trafaret.String(allow_blank=True), max_length=3)
+            )()
+            memo = trafaret_attr(trafaret.String() >> (lambda memo: memo))()
+
+        properties = SendInquiry.json_schema()['properties']
+        self.assertEqual(
+            properties['user_name'],
+            {'type': 'string', 'minLength': 1, 'maxLength': 32},
+        )
+        self.assertEqual(
+            properties['user_contact'], {'type': 'string', 'format': 'email'},
+        )
+        # Numbers are accepted as strings as trafaret does.
+        self.assertEqual(properties['volume'], {
+            'type': ['integer', 'string', 'boolean'],
+            'minimum': 1, 'exclusiveMaximum': 10,
+        })
+        self.assertEqual(properties['category'], {
+            'anyOf': [{'enum': ['bug', 'question']}, {'type': 'null'}],
+        })
+        self.assertEqual(properties['tags'], {
+            'type': 'array', 'items': {'type': 'string'}, 'maxItems': 3,
+        })
+        self.assertEqual(properties['memo'], {'type': 'string', 'minLength': 1})
+        self.assertEqual(
+            SendInquiry.json_schema()['required'],
+            ['user_name', 'user_contact', 'volume', 'tags', 'memo'],
+        )
@@ -1,8 +1,8 @@
 # encoding: utf-8
 
 import unittest
-from  voluptuous import Schema, All, Length, Range, Any
-from froshki import Froshki, validation_hook
+from  voluptuous import Schema, All, Length, Range, Any, Coerce
+from froshki import Froshki, CompactFroshki, validation_hook
 from froshki.ext.voluptuous_attr import VoluptuousPoweredAttribute, voluptuous_attr
 
 
@@ -102,3 +102,76 @@ class TestVoluptuousIntegration(unittest.TestCase):
                 source=attr_failure
             )
             self.assertFalse(pos.validate())
+
+    def test_bulk_validation(self):
+
+        for base in (Froshki, CompactFroshki):
+
+            class SearchText(base):
+                query = voluptuous_attr(Schema(All(str, Length(min=3))))(
+                    key_alias='q',
+                )
+                page_offset = voluptuous_attr(Schema(All(int, Range(min=0))))()
+                result_fields = voluptuous_attr(
+                    Schema(['document', 'line_no'])
+                )(nullable=True)
+                default_values = {'page_offset': 0}
+
+            class BulkSearchText(SearchText):
+                bulk_validation = True
+
+            self.assertIsNone(SearchText.get_schema().bulk_validator)
+            self.assertIsNotNone(BulkSearchText.get_schema().bulk_validator)
+
+            sources = (
+                dict(q='monday morning'),
+                dict(q='monday morning', result_fields=['line_no']),
+                dict(q='mo', page_offset=-1, result_fields=['hit_count', 3]),
+                dict(page_offset='1'),
+            )
+            for source in sources:
+                search_text = SearchText(source=source)
+                bulk_search_text = BulkSearchText(source=source)
+                self.assertEqual(
+                    bulk_search_text.validate(), search_text.validate(),
+                )
+                self.assertEqual(bulk_search_text.errors, search_text.errors)
+                self.assertEqual(
+                    dict(bulk_search_text.data_view), dict(search_text.data_view),
+                )
+
+    def test_json_schema(self):
+
+        class CloneRepo(Froshki):
+            repo_name = voluptuous_attr(Schema(All(str, Length(min=1))))()
+            trial_limit = voluptuous_attr(
+                Schema(All(int, Range(min=1, max=5, max_included=False)))
+            )()
+            readonly = voluptuous_attr(Schema(bool))()
+            fields = voluptuous_attr(Schema(['document', 'line_no']))()
+            user_id = voluptuous_attr(Schema(Any(str, None)))()
+            timeout = voluptuous_attr(Schema(All(Coerce(int), Range(min=1))))()
+
+        properties = CloneRepo.json_schema()['properties']
+        # Length keywords apply to values of their types only.
+        self.assertEqual(properties['repo_name'], {
+            'type': 'string', 'minLength': 1, 'minItems': 1, 'minProperties': 1,
+        })
+        self.assertEqual(properties['trial_limit'], {
+            'type': ['integer', 'boolean'],
+            'minimum': 1, 'exclusiveMaximum': 5,
+        })
+        self.assertEqual(properties['readonly'], {'type': 'boolean'})
+        self.assertEqual(properties['fields'], {
+            'type': 'array',
+            'items': {'anyOf': [{'const': 'document'}, {'const': 'line_no'}]},
+        })
+        self.assertEqual(properties['user_id'], {
+            'anyOf': [{'type': 'string'}, {'type': 'null'}],
+        })
+        # Values are converted for the rest of All.
+        self.assertEqual(properties['timeout'], {})
+        self.assertEqual(
+            CloneRepo.json_schema()['required'],
+            ['repo_name', 'trial_limit', 'readonly', 'fields'],
+        )
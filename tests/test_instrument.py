@@ -0,0 +1,154 @@
+# encoding: utf-8
+
+import unittest
+from froshki import Froshki, CompactFroshki, validation_hook, Attribute
+from froshki.instrument import instrument, ValidationObserver
+
+
+class ResourceId(Attribute):
+    @classmethod
+    def transform(klass, input_value):
+        return int(input_value)
+    @classmethod
+    def validate(klass, input_value):
+        if input_value in (1,5,7,9):
+            return True, input_value
+        else:
+            return False, 'resource id not found'
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_validation_stats(self):
+
+        class Download(Froshki):
+            resource_id = ResourceId()
+            filetype = Attribute()
+            @validation_hook.extend(error='pdf only')
+            def pdf_only(self):
+                return self.filetype == 'pdf'
+
+        with instrument() as stats:
+            self.assertTrue(Download(resource_id='9', filetype='pdf').validate())
+            download = Download(resource_id='x', filetype='txt')
+            self.assertFalse(download.validate())
+            self.assertEqual(
+                download.errors,
+                {'resource_id': 'data conversion error: x',
+                 'pdf_only': 'pdf only'},
+            )
+        Download(resource_id='5', filetype='pdf').validate()  # Not recorded.
+
+        snapshot = stats.snapshot()
+        self.assertEqual(
+            sorted(snapshot),
+            ['Download.filetype', 'Download.pdf_only', 'Download.resource_id'],
+        )
+        resource_id = snapshot['Download.resource_id']
+        self.assertEqual(resource_id['kind'], 'attribute')
+        self.assertEqual(resource_id['calls'], 2)
+        self.assertEqual(resource_id['failures'], 1)
+        self.assertEqual(resource_id['exceptions'], {'ValueError': 1})
+        self.assertGreaterEqual(resource_id['seconds'], 0)
+        self.assertEqual(snapshot['Download.pdf_only']['kind'], 'hook')
+        self.assertEqual(snapshot['Download.pdf_only']['failures'], 1)
+
+        prometheus = stats.to_prometheus()
+        self.assertIn(
+            'froshki_validation_calls_total'
+            '{model="Download",name="resource_id",kind="attribute"} 2',
+            prometheus,
+        )
+        self.assertIn(
+            'froshki_validation_exceptions_total'
+            '{model="Download",name="resource_id",kind="attribute",'
+            'exception="ValueError"} 1',
+            prometheus,
+        )
+        self.assertIn('# TYPE froshki_validation_seconds_total counter', prometheus)
+
+    def test_custom_observer(self):
+
+        class Recorder(ValidationObserver):
+            def __init__(self):
+                self.records = []
+            def record(self, model_name, name, kind, seconds,
+                       is_valid, exception_type=None):
+                self.records.append((model_name, name, kind, is_valid))
+
+        class Failing(Attribute):
+            @classmethod
+            def validate(klass, input_value):
+                raise RuntimeError('broken validator')
+
+        class Compact(CompactFroshki):
+            resource_id = ResourceId()
+            broken = Failing(nullable=True)
+
+        with instrument(Recorder()) as recorder:
+            self.assertFalse(Compact(resource_id='2').validate())
+            with self.assertRaises(RuntimeError):
+                Compact(resource_id='1', broken=True).validate()
+        self.assertEqual(
+            set(recorder.records[:2]),
+            set([('Compact', 'resource_id', 'attribute', False),
+                 ('Compact', 'broken', 'attribute', True)]),
+        )
+        # Exceptions are reported as neither valid nor invalid.
+        self.assertEqual(
+            recorder.records[-1], ('Compact', 'broken', 'attribute', None),
+        )
+
+    def test_conversion_errors(self):
+
+        class Abort(BaseException):
+            pass
+
+        class Aborting(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                raise Abort()
+
+        class Download(Froshki):
+            resource_id = Aborting()
+
+        # Any exception is a conversion error, instrumented or not.
+        self.assertFalse(Download(resource_id='1').validate())
+        with instrument() as stats:
+            download = Download(resource_id='1')
+            self.assertFalse(download.validate())
+        self.assertEqual(
+            download.errors, {'resource_id': 'data conversion error: 1'},
+        )
+        self.assertEqual(
+            stats.snapshot()['Download.resource_id']['exceptions'], {'Abort': 1},
+        )
+
+    def test_fail_fast_and_partial(self):
+
+        class Recorder(ValidationObserver):
+            def __init__(self):
+                self.records = []
+            def record(self, model_name, name, kind, seconds,
+                       is_valid, exception_type=None):
+                self.records.append((name, kind, is_valid))
+
+        class Download(Froshki):
+            resource_id = ResourceId()
+            filetype = Attribute(cost=1)
+            @validation_hook.extend(depends=('filetype',))
+            def pdf_only(self):
+                return self.filetype == 'pdf'
+
+        with instrument(Recorder()) as recorder:
+            download = Download(resource_id='x', filetype='pdf')
+            self.assertFalse(download.validate(fail_fast=True))
+            self.assertTrue(download.validate(only=('filetype',)))
+            self.assertTrue(Download.partial()(resource_id='9').validate())
+        self.assertEqual(
+            recorder.records,
+            [('resource_id', 'attribute', False),
+             ('filetype', 'attribute', True),
+             ('pdf_only', 'hook', True),
+             ('resource_id', 'attribute', True)],
+        )
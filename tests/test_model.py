@@ -1,7 +1,22 @@
 # encoding: utf-8
 
+import abc
+import collections
+import functools
+import itertools
+import json
+import threading
+import time
 import unittest
-from froshki import Froshki, validation_hook, Attribute
+from froshki import (
+    Froshki, CompactFroshki, validation_hook, Attribute, ModelAttribute, ListOf,
+    FroshkiMeta,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 try:
     import clr
@@ -187,6 +202,16 @@ class TestAttributeModeling(unittest.TestCase):
         self.assertEqual(like_switch.date_liked, '2013/05/13')
         self.assertEqual(like_switch.like_on, True)
 
+    def test_bare_model(self):
+
+        froshki = Froshki(ignore_unknown_keys=True, source={'uri': 'x'})
+        self.assertTrue(isinstance(froshki, Froshki))
+        self.assertEqual(type(froshki).__name__, 'Froshki')
+        self.assertTrue(froshki.validate())
+        self.assertEqual(froshki.data, {})
+        with self.assertRaises(TypeError):
+            Froshki(uri='http://github.com')
+
     def test_attribute_mixin(self):
 
         class Switch(object):
@@ -209,6 +234,109 @@ class TestAttributeModeling(unittest.TestCase):
         self.assertEqual(like_switch.date_liked, '2013/05/13')
         self.assertEqual(like_switch.on, True)
 
+    def test_metaclass_mixin(self):
+
+        Sized = abc.ABCMeta('Sized', (object,), {
+            'size': abc.abstractmethod(lambda self: None),
+        })
+
+        # Metaclasses are to be combined explicitly.
+        with self.assertRaises(TypeError):
+            class Shipment(Froshki, Sized):
+                weight = Attribute()
+
+        ABCFroshkiMeta = type('ABCFroshkiMeta', (FroshkiMeta, abc.ABCMeta), {})
+        Shipment = ABCFroshkiMeta('Shipment', (Froshki, Sized), {
+            'weight': Attribute(),
+        })
+        with self.assertRaises(TypeError):
+            Shipment(weight=3)  # Still abstract.
+        SizedShipment = ABCFroshkiMeta('SizedShipment', (Shipment,), {
+            'size': lambda self: self.weight,
+        })
+        sized_shipment = SizedShipment(weight=3)
+        self.assertTrue(sized_shipment.validate())
+        self.assertEqual(sized_shipment.size(), 3)
+        self.assertTrue(isinstance(sized_shipment, Sized))
+        SizedShipment.height = Attribute()
+        self.assertIn('height', SizedShipment.get_schema().attr_names)
+
+    def test_read_only_views(self):
+
+        class PositiveInt(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                if input_value > 0:
+                    return True, input_value
+                else:
+                    return False, 'not positive'
+
+        for base in (Froshki, CompactFroshki):
+
+            class Page(base):
+                number = PositiveInt()
+                size = PositiveInt()
+
+            page = Page(number='3')
+            data_view = page.data_view
+            errors_view = page.errors_view
+            self.assertEqual(dict(data_view), {'number': '3'})
+            self.assertFalse(page.validate())
+            # Views follow the storage.
+            self.assertEqual(data_view['number'], 3)
+            self.assertEqual(set(errors_view), set(['size']))
+            with self.assertRaises(TypeError):
+                data_view['number'] = 4
+            snapshot = data_view.copy()
+            page.size = 10
+            self.assertTrue(page.validate())
+            self.assertEqual(dict(data_view), dict(number=3, size=10))
+            self.assertEqual(len(errors_view), 0)
+            self.assertNotIn('size', snapshot)
+
+    def test_reset(self):
+
+        class PositiveInt(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                if input_value > 0:
+                    return True, input_value
+                else:
+                    return False, 'not positive'
+
+        for base in (Froshki, CompactFroshki):
+
+            class Page(base):
+                number = PositiveInt(key_alias='page')
+                size = PositiveInt()
+                default_values = {'size': 20}
+                @validation_hook.extend(error='too far', depends=('number',))
+                def limit_number(self):
+                    return self.number < 100
+
+            page = Page(page='200')
+            self.assertFalse(page.validate())
+            self.assertIs(page.reset(source={'page': '3'}), page)
+            self.assertEqual(page.errors, {})
+            self.assertTrue(page.validate())
+            self.assertEqual(page.data, dict(number=3, size=20))
+            page.reset(number=0, size=10)
+            self.assertFalse(page.validate())
+            self.assertEqual(page.errors, {'number': 'not positive'})
+            with self.assertRaises(TypeError):
+                page.reset(source={'lang': 'ja'})
+            page.reset(source={'page': 4, 'lang': 'ja'}, ignore_unknown_keys=True)
+            self.assertTrue(page.validate())
+            # Not kept over resets.
+            with self.assertRaises(TypeError):
+                page.reset(source={'page': 4, 'lang': 'ja'})
+
 
 class TestAttrValidation(unittest.TestCase):
 
@@ -301,6 +429,53 @@ class TestAttrValidation(unittest.TestCase):
         self.assertTrue(register_user.validate())
         self.assertEqual(register_user.nickname, 'mksh')
 
+    @unittest.skipIf(
+        not hasattr(functools, 'lru_cache'), 'no validation caches on Python 2',
+    )
+    def test_validation_cache(self):
+
+        calls = []
+
+        class Filetype(Attribute):
+            cache_size = 2
+            @classmethod
+            def transform(klass, input_value):
+                calls.append(input_value)
+                return input_value.lower()
+            @classmethod
+            def validate(klass, input_value):
+                if input_value in ('pdf', 'txt', 'mobi'):
+                    return True, input_value
+                else:
+                    return False, 'filetype unavailable'
+
+        class Tags(Attribute):
+            cache_size = 2
+
+        class Download(Froshki):
+            filetype = Filetype()
+            tags = Tags(nullable=True)
+
+        for filetype in ('PDF', 'PDF', 'doc', 'PDF'):
+            download = Download(filetype=filetype)
+            self.assertEqual(download.validate(), filetype == 'PDF')
+        self.assertEqual(calls, ['PDF', 'doc'])
+        info = Filetype.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 2, 2))
+        # Least recently used values are evicted.
+        Download(filetype='TXT').validate()
+        Download(filetype='PDF').validate()
+        self.assertEqual(calls, ['PDF', 'doc', 'TXT'])
+        Download(filetype='doc').validate()
+        self.assertEqual(calls, ['PDF', 'doc', 'TXT', 'doc'])
+        # Unhashable values are validated without cache.
+        download = Download(filetype='txt', tags=['a', 'b'])
+        self.assertTrue(download.validate())
+        self.assertEqual(download.tags, ['a', 'b'])
+        self.assertIsNone(Tags.cache_info())
+        Filetype.cache_clear()
+        self.assertEqual(Filetype.cache_info().currsize, 0)
+
 
 class TestComplexFunctions(unittest.TestCase):
 
@@ -433,6 +608,288 @@ class TestComplexFunctions(unittest.TestCase):
             dict(check_event_duration='event must start before the end')
         )
 
+    def test_validation_hook_dependencies(self):
+
+        calls = []
+
+        def define_event(base, generate_methods=False):
+
+            class CreateEvent(base):
+                event_name = Attribute()
+                event_start = Attribute()
+                event_end = Attribute()
+                @validation_hook.extend(
+                    error='event must start before the end',
+                    depends=('event_start', 'event_end'),
+                )
+                def check_event_duration(self):
+                    calls.append('duration')
+                    return self.event_start < self.event_end
+                @validation_hook
+                def check_name(self):
+                    calls.append('name')
+                    return bool(self.event_name)
+            CreateEvent.generate_methods = generate_methods
+            return CreateEvent
+
+        for base, generate_methods in ((Froshki, False), (Froshki, True),
+                                       (CompactFroshki, False)):
+            del calls[:]
+            create_event = define_event(base, generate_methods)(
+                event_name='Hack your forms', event_start=17, event_end=16,
+            )
+            self.assertFalse(create_event.validate())
+            self.assertEqual(sorted(calls), ['duration', 'name'])
+            create_event.event_name = 'Hack your models'
+            self.assertFalse(create_event.validate())  # Reuses the failure.
+            self.assertEqual(sorted(calls), ['duration', 'name', 'name'])
+            self.assertEqual(
+                create_event.errors,
+                dict(check_event_duration='event must start before the end')
+            )
+            create_event.event_end = 20
+            self.assertTrue(create_event.validate())
+            self.assertEqual(
+                sorted(calls), ['duration', 'duration', 'name', 'name', 'name'],
+            )
+            self.assertEqual(create_event.errors, {})
+
+        with self.assertRaises(TypeError):
+            class BrokenEvent(Froshki):
+                event_start = Attribute()
+                @validation_hook.extend(depends=('event_stat',))
+                def check_start(self):
+                    return True
+            BrokenEvent()
+
+    def test_revalidate_errors(self):
+
+        calls = []
+
+        class Positive(Attribute):
+            @classmethod
+            def validate(klass, input_value):
+                calls.append(input_value)
+                if input_value > 0:
+                    return True, input_value
+                else:
+                    return False, 'not positive'
+
+        class Volume(Froshki):
+            revalidate_errors = False
+            volume = Positive()
+            price = Positive()
+
+        volume = Volume(volume=-1, price=3)
+        self.assertFalse(volume.validate())
+        volume.price = 4
+        self.assertFalse(volume.validate())  # Error kept without revalidation.
+        self.assertEqual(sorted(calls), [-1, 3, 4])
+        self.assertEqual(volume.errors, {'volume': 'not positive'})
+        volume.volume = 1
+        self.assertTrue(volume.validate())
+
+    def test_lazy_validation(self):
+
+        calls = []
+
+        class Count(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                calls.append(input_value)
+                return int(input_value)
+
+        for generate_methods in (False, True):
+
+            class Order(Froshki):
+                lazy_validation = True
+                item_id = Count()
+                quantity = Count()
+                comment = Attribute(nullable=True)
+                @validation_hook.extend(
+                    error='too many', depends=('quantity',),
+                )
+                def limit_quantity(self):
+                    calls.append('limit')
+                    return self.quantity <= 10
+            Order.generate_methods = generate_methods
+
+            del calls[:]
+            order = Order(item_id='3', quantity='2')
+            self.assertEqual(order.quantity, 2)  # Validated on access.
+            self.assertEqual(order.quantity, 2)
+            self.assertEqual(calls, ['2'])
+            self.assertEqual(order.errors, {})
+            self.assertEqual(calls, ['2', '3', 'limit'])
+            self.assertEqual(
+                order.data, dict(item_id=3, quantity=2, comment=None),
+            )
+            self.assertEqual(calls, ['2', '3', 'limit'])  # Nothing pending.
+
+            order.quantity = '20'
+            self.assertEqual(order.quantity, 20)
+            self.assertEqual(order.errors, dict(limit_quantity='too many'))
+            self.assertEqual(calls, ['2', '3', 'limit', '20', 'limit'])
+            self.assertFalse(order.validate())
+
+            order.item_id = 'x'
+            self.assertIsNone(order.comment)
+            self.assertEqual(order.item_id, 'x')  # Invalid input kept.
+            self.assertIn('item_id', order.errors)
+
+    def test_fail_fast(self):
+
+        calls = []
+
+        class Positive(Attribute):
+            @classmethod
+            def validate(klass, input_value):
+                calls.append(input_value)
+                if input_value > 0:
+                    return True, input_value
+                else:
+                    return False, 'not positive'
+
+        class CheapPositive(Positive):
+            cost = -1
+
+        for base in (Froshki, CompactFroshki):
+
+            class Shipment(base):
+                weight = Positive(cost=10)
+                width = Positive()
+                count = CheapPositive()
+                @validation_hook.extend(error='too heavy')
+                def check_weight(self):
+                    calls.append('hook')
+                    return self.weight < 100
+
+            self.assertEqual(
+                Shipment.get_schema().validation_order,
+                ('count', 'width', 'weight'),
+            )
+            del calls[:]
+            shipment = Shipment(weight=5, width=-1, count=2)
+            self.assertFalse(shipment.validate(fail_fast=True))
+            self.assertEqual(calls, [2, -1])
+            self.assertEqual(shipment.errors, {'width': 'not positive'})
+            shipment.width = 3
+            self.assertTrue(shipment.validate(fail_fast=True))
+            self.assertEqual(calls, [2, -1, 3, 5, 'hook'])
+            shipment.weight = 200
+            self.assertFalse(shipment.validate(fail_fast=True))
+            self.assertEqual(shipment.errors, {'check_weight': 'too heavy'})
+            self.assertFalse(shipment.validate())
+            # Errors of hooks left unchecked are not kept.
+            shipment.width = -1
+            self.assertFalse(shipment.validate(fail_fast=True))
+            self.assertEqual(shipment.errors, {'width': 'not positive'})
+            shipment.width = 3
+            self.assertFalse(shipment.validate(fail_fast=True))
+            self.assertEqual(shipment.errors, {'check_weight': 'too heavy'})
+
+    def test_partial_validation(self):
+
+        calls = []
+
+        class Positive(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                calls.append(input_value)
+                if input_value > 0:
+                    return True, input_value
+                else:
+                    return False, 'not positive'
+
+        for base in (Froshki, CompactFroshki):
+
+            class Shipment(base):
+                weight = Positive(key_alias='w')
+                width = Positive()
+                count = Positive()
+                default_values = {'count': 1}
+                @validation_hook.extend(error='too heavy', depends=('weight',))
+                def check_weight(self):
+                    calls.append('weight hook')
+                    return isinstance(self.weight, int) and self.weight < 100
+                @validation_hook.extend(error='too wide', depends=('width',))
+                def check_width(self):
+                    calls.append('width hook')
+                    return isinstance(self.width, int) and self.width < 100
+                @validation_hook
+                def check_all(self):
+                    calls.append('hook')
+                    return True
+
+            del calls[:]
+            shipment = Shipment(w='200')
+            self.assertFalse(shipment.validate(only=('w',)))
+            self.assertEqual(calls, [200, 'weight hook'])
+            self.assertEqual(shipment.errors, {'check_weight': 'too heavy'})
+            with self.assertRaises(TypeError):
+                shipment.validate(only=('height',))
+            # Validated attributes are not validated again.
+            shipment.weight = '5'
+            del calls[:]
+            self.assertTrue(shipment.validate(only=('weight', 'count')))
+            self.assertEqual(sorted(calls[:2]), [1, 5])
+            self.assertEqual(calls[2:], ['weight hook'])
+            attr_names, validator_names = Shipment.get_schema().partial_plans[
+                frozenset(['weight', 'count'])
+            ]
+            self.assertEqual(set(attr_names), set(['weight', 'count']))
+            self.assertEqual(validator_names, ('check_weight',))
+            # The rest is left to validate.
+            del calls[:]
+            self.assertFalse(shipment.validate())
+            self.assertEqual(sorted(calls), ['hook', 'width hook'])
+            self.assertIn('width', shipment.errors)
+            shipment.width = '-3'
+            del calls[:]
+            self.assertFalse(shipment.validate(fail_fast=True, only=['width']))
+            self.assertEqual(calls, [-3])
+            self.assertEqual(shipment.errors['width'], 'not positive')
+
+            PatchShipment = Shipment.partial()
+            self.assertIs(Shipment.partial(), PatchShipment)
+            self.assertIs(PatchShipment.partial(), PatchShipment)
+            self.assertTrue(issubclass(PatchShipment, Shipment))
+            del calls[:]
+            patch_shipment = PatchShipment(source={'width': '10'})
+            self.assertTrue(patch_shipment.validate())
+            self.assertEqual(calls, [10, 'width hook'])
+            self.assertEqual(dict(patch_shipment.data_view), {'width': 10})
+            patch_shipment.weight = '500'
+            self.assertFalse(patch_shipment.validate())
+            self.assertEqual(
+                patch_shipment.errors, {'check_weight': 'too heavy'},
+            )
+            # Batches are validated as partial models too.
+            del calls[:]
+            records, errors = PatchShipment.validate_many(
+                [{'width': '10'}, {'w': '500'}, {}],
+            )
+            self.assertEqual(records, [{'width': 10}, {}])
+            self.assertEqual(errors, {1: {'check_weight': 'too heavy'}})
+            self.assertEqual(
+                set(calls), set([500, 10, 'weight hook', 'width hook']),
+            )
+            self.assertEqual(
+                [index for index, data, errors in PatchShipment.iter_validate(
+                    [{'w': '500'}, {'width': '10'}], drop_invalid=True,
+                )],
+                [1],
+            )
+            columns, mask, errors = PatchShipment.validate_columns(
+                {'w': ['5', '500']},
+            )
+            self.assertEqual(list(columns), ['weight'])
+            self.assertEqual(list(mask), [True, False])
+            self.assertEqual(errors, {'check_weight': {1: 'too heavy'}})
+
     def test_ignore_unknown_keys(self):
 
         class Configuration(Froshki):
@@ -460,3 +917,642 @@ class TestComplexFunctions(unittest.TestCase):
                 ignore_unknown_keys=False,
             )
         self.assertTrue(Configuration.ignore_unknown_keys)
+
+    def test_ignore_many_unknown_keys(self):
+
+        for generate_methods in (False, True):
+
+            class Configuration(Froshki):
+                filter_level = Attribute(key_alias='level')
+                prediction = Attribute()
+            Configuration.generate_methods = generate_methods
+
+            # Sources with more keys than known ones.
+            attr_source = dict(
+                ('option_{0}'.format(index), index) for index in range(10)
+            )
+            attr_source.update(level='high', prediction=True)
+            config = Configuration(
+                source=attr_source, ignore_unknown_keys=True,
+            )
+            self.assertEqual(
+                config.data, dict(filter_level='high', prediction=True),
+            )
+            with self.assertRaises(TypeError):
+                Configuration(source=attr_source)
+            records, errors = Configuration.validate_many(
+                [attr_source], ignore_unknown_keys=True,
+            )
+            self.assertEqual(
+                records, [dict(filter_level='high', prediction=True)],
+            )
+
+            # The latter of a name & its alias wins, with any source size.
+            for extra_keys in (0, 10):
+                attr_source = collections.OrderedDict(
+                    [('level', 'high'), ('filter_level', 'low')]
+                )
+                attr_source.update(
+                    ('option_{0}'.format(index), index)
+                    for index in range(extra_keys)
+                )
+                config = Configuration(
+                    source=attr_source, ignore_unknown_keys=True,
+                )
+                self.assertEqual(config.data['filter_level'], 'low')
+
+
+class TestModelSchema(unittest.TestCase):
+
+    def test_schema_compiled_once(self):
+
+        class Search(Froshki):
+            search_key = Attribute(key_alias='key')
+            search_type = Attribute(nullable=True)
+
+        first = Search(key='japanese furoshiki')
+        schema = Search._schema
+        self.assertEqual(schema.attr_names, ('search_key', 'search_type'))
+        self.assertEqual(schema.attr_aliases, {'key': 'search_key'})
+        self.assertEqual(schema.nullable_attrs, frozenset(['search_type']))
+        second = Search(key='russian pirozhki')
+        self.assertIs(Search._schema, schema)  # No recompilation.
+        self.assertTrue(first.validate())
+        self.assertTrue(second.validate())
+
+    def test_schema_recompiled_on_mutation(self):
+
+        class Like(Froshki):
+            uri = Attribute()
+
+        class LikeSwitch(Like):
+            like_on = Attribute()
+
+        Like(uri='http://github.com')
+        LikeSwitch(uri='http://github.com', like_on=True)
+        Like.user = Attribute()
+        # Compiled subclasses are also recompiled.
+        self.assertEqual(Like._schema.attr_names, ('uri', 'user'))
+        self.assertEqual(
+            set(LikeSwitch._schema.attr_names),
+            set(['uri', 'user', 'like_on']),
+        )
+        like_switch = LikeSwitch(
+            uri='http://github.com', user='ymat', like_on=True,
+        )
+        self.assertTrue(like_switch.validate())
+
+    def test_subclass_overrides_attribute(self):
+
+        class Upper(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return input_value.upper()
+
+        class Tag(Froshki):
+            name = Attribute()
+
+        class UpperTag(Tag):
+            name = Upper()
+
+        tag = UpperTag(name='furoshiki')
+        self.assertTrue(tag.validate())
+        self.assertEqual(tag.name, 'FUROSHIKI')
+        self.assertEqual(UpperTag._schema.attr_names, ('name',))
+
+    def test_concurrent_compilation(self):
+
+        compilations = []
+
+        class Like(Froshki):
+            uri = Attribute()
+            user = Attribute()
+            @classmethod
+            def find_extra_validators(klass):
+                compilations.append(klass)
+                time.sleep(0.01)  # Widen the race window.
+                return Froshki.find_extra_validators.__func__(klass)
+
+        ready = threading.Event()
+        results = []
+
+        def like():
+            ready.wait()
+            results.append(Like(uri='http://github.com', user='ymat').validate())
+
+        threads = [threading.Thread(target=like) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        ready.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(compilations, [Like])
+        self.assertEqual(results, [True] * 8)
+
+    def test_json_schema(self):
+
+        class Text(Attribute):
+            @classmethod
+            def json_schema(klass):
+                return {'type': 'string'}
+
+        class Author(Froshki):
+            name = Text()
+
+        class Book(Froshki):
+            title = Text()
+            isbn = Text(key_alias='isbn13')
+            note = Text(nullable=True)
+            lang = Text()
+            extra = Attribute()
+            author = ModelAttribute(Author)
+            reviewers = ListOf(Author)
+            default_values = {'lang': 'ja'}
+
+        schema = Book.json_schema()
+        self.assertIs(Book.json_schema(), schema)
+        self.assertEqual(schema['title'], 'Book')
+        self.assertEqual(schema['type'], 'object')
+        self.assertFalse(schema['additionalProperties'])
+        properties = schema['properties']
+        self.assertEqual(properties['title'], {'type': 'string'})
+        self.assertEqual(properties['isbn13'], properties['isbn'])
+        self.assertEqual(
+            properties['note'], {'anyOf': [{'type': 'string'}, {'type': 'null'}]},
+        )
+        self.assertEqual(properties['lang'], {'type': 'string', 'default': 'ja'})
+        self.assertEqual(properties['extra'], {})
+        self.assertEqual(
+            properties['author']['properties'], {'name': {'type': 'string'}},
+        )
+        self.assertEqual(properties['reviewers']['type'], 'array')
+        self.assertEqual(properties['reviewers']['items'], properties['author'])
+        # Values allowed to be None are not required.
+        self.assertEqual(
+            set(schema['required']), set(['title', 'author', 'reviewers']),
+        )
+        self.assertEqual(schema['allOf'], [
+            {'anyOf': [{'required': ['isbn']}, {'required': ['isbn13']}]},
+        ])
+        self.assertEqual(properties['author']['required'], ['name'])
+
+        class LooseBook(Book):
+            ignore_unknown_keys = True
+        self.assertNotIn('additionalProperties', LooseBook.json_schema())
+
+        # Partial models require nothing.
+        partial_schema = Book.partial().json_schema()
+        self.assertNotIn('required', partial_schema)
+        self.assertNotIn('allOf', partial_schema)
+
+        # Rebuilt on schema changes.
+        Book.isbn = Text(key_alias='isbn10')
+        self.assertIn('isbn10', Book.json_schema()['properties'])
+
+
+class TestGeneratedMethods(unittest.TestCase):
+
+    def test_generated_validation(self):
+
+        class ResourceId(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                if input_value in (1,5,7,9):
+                    return True, input_value
+                else:
+                    return False, 'resource id not found'
+
+        class Lowered(Attribute):
+            @classmethod
+            def _validate(klass, input_value):
+                return True, input_value.lower()
+
+        class Download(Froshki):
+            generate_methods = True
+            resource_id = ResourceId(key_alias='id')
+            filetype = Lowered()
+            note = ResourceId(nullable=True)
+            @validation_hook.extend(error='pdf only')
+            def pdf_only(self):
+                return self.filetype == 'pdf'
+
+        download = Download(source={'id': '9'}, filetype='PDF')
+        self.assertIsNotNone(Download._schema.generated_validate)
+        self.assertTrue(download.validate())
+        self.assertEqual(
+            download.data,
+            {'resource_id': 9, 'filetype': 'pdf', 'note': None},
+        )
+        download.resource_id = 'x9'
+        download.filetype = 'TXT'
+        self.assertFalse(download.validate())
+        self.assertEqual(
+            download.errors,
+            {'resource_id': 'data conversion error: x9',
+             'pdf_only': 'pdf only'},
+        )
+        download.resource_id = '5'
+        download.filetype = 'pdf'
+        self.assertTrue(download.validate())
+        self.assertEqual(download.errors, {})
+        with self.assertRaises(TypeError):
+            Download(source={'id': '9', 'lang': 'ja'})
+        download = Download(
+            source={'id': '9', 'lang': 'ja'}, ignore_unknown_keys=True,
+        )
+        self.assertEqual(download.resource_id, '9')
+
+
+class TestCompactStorage(unittest.TestCase):
+
+    def test_compact_model(self):
+
+        class ResourceId(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                if input_value in (1,5,7,9):
+                    return True, input_value
+                else:
+                    return False, 'resource id not found'
+
+        class Download(CompactFroshki):
+            resource_id = ResourceId(key_alias='id')
+            filetype = Attribute()
+            note = Attribute(nullable=True)
+            @validation_hook.extend(error='pdf only')
+            def pdf_only(self):
+                return self.filetype == 'pdf'
+
+        download = Download(source={'id': '9'}, filetype='pdf')
+        self.assertFalse(hasattr(download, '__dict__'))
+        self.assertIsNone(download._errors)  # Allocated lazily.
+        self.assertEqual(download.note, None)
+        self.assertEqual(download.data, {'resource_id': '9', 'filetype': 'pdf'})
+        self.assertTrue(download.validate())
+        self.assertEqual(download.resource_id, 9)
+        self.assertIsNone(download._errors)
+        self.assertEqual(
+            download.data,
+            {'resource_id': 9, 'filetype': 'pdf', 'note': None},
+        )
+        download.resource_id = '99'  # Invalidate by assignment.
+        download.filetype = 'txt'
+        self.assertFalse(download.validate())
+        self.assertFalse(download.validate())  # Consistent validation.
+        self.assertEqual(
+            download.errors,
+            {'resource_id': 'resource id not found', 'pdf_only': 'pdf only'},
+        )
+        download.resource_id = '5'
+        download.filetype = 'pdf'
+        self.assertTrue(download.validate())
+        self.assertEqual(download.errors, {})
+        with self.assertRaises(AttributeError):
+            download.user = 'ymat'
+        records, errors = Download.validate_many(
+            [{'id': 1, 'filetype': 'pdf'}, {'id': 1, 'filetype': 'txt'}]
+        )
+        self.assertEqual(errors, {1: {'pdf_only': 'pdf only'}})
+
+        # Unsupported options.
+        for option in ('generate_methods', 'lazy_validation'):
+            Unsupported = type('Unsupported', (CompactFroshki,), {
+                'filetype': Attribute(), option: True,
+            })
+            with self.assertRaises(TypeError):
+                Unsupported(filetype='pdf')
+
+
+class TestBatchValidation(unittest.TestCase):
+
+    def test_validate_many(self):
+
+        class ResourceId(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                if input_value in (1,5,7,9):
+                    return True, input_value
+                else:
+                    return False, 'resource id not found'
+
+        class Download(Froshki):
+            resource_id = ResourceId(key_alias='id')
+            filetype = Attribute()
+            note = Attribute(nullable=True)
+            @validation_hook.extend(error='pdf only')
+            def pdf_only(self):
+                return self.filetype == 'pdf'
+
+        sources = [
+            {'id': '9', 'filetype': 'pdf'},
+            {'resource_id': 'x', 'filetype': 'pdf'},
+            {'resource_id': '2', 'filetype': 'txt', 'note': 'n'},
+            {'resource_id': 5, 'filetype': 'pdf', 'note': 'n'},
+        ]
+        records, errors = Download.validate_many(sources)
+        self.assertEqual(
+            records,
+            [{'resource_id': 9, 'filetype': 'pdf', 'note': None},
+             {'resource_id': 5, 'filetype': 'pdf', 'note': 'n'}],
+        )
+        self.assertEqual(
+            errors,
+            {1: {'resource_id': 'data conversion error: x'},
+             2: {'resource_id': 'resource id not found',
+                 'pdf_only': 'pdf only'}},
+        )
+        # Consistent with per-instance validation.
+        for index, source in enumerate(sources):
+            download = Download(source=source)
+            self.assertEqual(download.validate(), index not in errors)
+            self.assertEqual(download.errors, errors.get(index, {}))
+        with self.assertRaises(TypeError):
+            Download.validate_many([{'lang': 'ja'}])
+        records, errors = Download.validate_many(
+            [{'id': 1, 'filetype': 'pdf', 'lang': 'ja'}],
+            ignore_unknown_keys=True,
+        )
+        self.assertEqual(len(records), 1)
+
+    def test_batched_attribute_hooks(self):
+
+        calls = []
+
+        class BatchInt(Attribute):
+            @classmethod
+            def transform_batch(klass, input_values):
+                calls.append(list(input_values))
+                return [int(input_value) for input_value in input_values]
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate_batch(klass, input_values):
+                return (
+                    [input_value > 0 for input_value in input_values],
+                    [input_value if input_value > 0 else 'not positive'
+                     for input_value in input_values],
+                )
+
+        class Volume(Froshki):
+            volume = BatchInt()
+
+        records, errors = Volume.validate_many(
+            [{'volume': '3'}, {'volume': '-1'}, {'volume': 'a'}]
+        )
+        self.assertEqual(calls, [['3', '-1', 'a']])  # One call per column.
+        self.assertEqual(records, [{'volume': 3}])
+        self.assertEqual(
+            errors,
+            {1: {'volume': 'not positive'},
+             2: {'volume': 'data conversion error: a'}},
+        )
+
+    def test_validate_columns(self):
+
+        class Filetype(Attribute):
+            @classmethod
+            def validate(klass, input_value):
+                if input_value in ('pdf', 'txt', 'mobi'):
+                    return True, input_value
+                else:
+                    return False, 'filetype unavailable'
+
+        class IntAttribute(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+
+        class Download(Froshki):
+            resource_id = IntAttribute(key_alias='id')
+            filetype = Filetype()
+            note = IntAttribute(nullable=True)
+            user = Attribute()
+            lang = Attribute(key_alias='language')
+            default_values = {'user': 'ymat', 'language': 'ja'}
+            @validation_hook
+            def not_txt(self):
+                return self.filetype != 'txt'
+            @validation_hook.extend(error='no id')
+            def has_id(self):
+                return self.resource_id is not None
+
+        columns, mask, errors = Download.validate_columns({
+            'id': ['1', '2', 'x', '4'],
+            'filetype': ['pdf', 'doc', 'pdf', 'txt'],
+            'note': [None, '3', None, None],
+        })
+        self.assertEqual(mask, [True, False, False, False])
+        # Hooks see input values of invalid attributes.
+        self.assertEqual(
+            errors,
+            {'filetype': {1: 'filetype unavailable'},
+             'resource_id': {2: 'data conversion error: x'}},
+        )
+        self.assertEqual(list(columns['resource_id'])[:2], [1, 2])
+        self.assertEqual(list(columns['note']), [None, 3, None, None])
+        self.assertEqual(list(columns['user']), ['ymat'] * 4)
+        self.assertEqual(list(columns['lang']), ['ja'] * 4)
+        with self.assertRaises(ValueError):
+            Download.validate_columns({'id': [1], 'filetype': []})
+        with self.assertRaises(TypeError):
+            Download.validate_columns({'region': ['jp']})
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_validate_numpy_columns(self):
+
+        class ResourceId(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def transform_batch(klass, input_values):
+                return numpy.asarray(input_values, dtype=int)
+            @classmethod
+            def validate_batch(klass, input_values):
+                validities = numpy.isin(input_values, (1,5,7,9))
+                return validities, numpy.where(
+                    validities, input_values, -1,
+                )
+
+        class Download(Froshki):
+            resource_id = ResourceId()
+
+        columns, mask, errors = Download.validate_columns(
+            {'resource_id': numpy.array(['1', '2', '9'])}
+        )
+        self.assertEqual(mask.tolist(), [True, False, True])
+        self.assertEqual(errors, {'resource_id': {1: -1}})
+        self.assertEqual(columns['resource_id'][mask].tolist(), [1, 9])
+        # Falls back to scalar transforms to locate conversion errors.
+        columns, mask, errors = Download.validate_columns(
+            {'resource_id': numpy.array(['1', 'x'])}
+        )
+        self.assertEqual(mask.tolist(), [True, False])
+        self.assertEqual(
+            errors, {'resource_id': {1: 'data conversion error: x'}},
+        )
+
+    def test_iter_validate(self):
+
+        class Positive(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                if input_value > 0:
+                    return True, input_value
+                else:
+                    return False, 'not positive'
+
+        class Event(Froshki):
+            count = Positive()
+
+        consumed = []
+        def sources():
+            for count in itertools.count(1):
+                consumed.append(count)
+                yield {'count': count if count % 4 else -count}
+
+        # Lazy over unbounded input.
+        validated = Event.iter_validate(sources(), chunk_size=3)
+        self.assertEqual(
+            list(itertools.islice(validated, 4)),
+            [(0, {'count': 1}, {}), (1, {'count': 2}, {}),
+             (2, {'count': 3}, {}), (3, {'count': -4}, {'count': 'not positive'})],
+        )
+        self.assertEqual(len(consumed), 6)
+
+        del consumed[:]
+        validated = Event.iter_validate(
+            sources(), chunk_size=2, stop_on_error=True,
+        )
+        self.assertEqual([index for index, data, errors in validated], [0, 1, 2, 3])
+        self.assertEqual(len(consumed), 4)
+
+        validated = Event.iter_validate(
+            ({'count': count} for count in (1, -2, 3)), drop_invalid=True,
+        )
+        self.assertEqual(
+            list(validated),
+            [(0, {'count': 1}, {}), (2, {'count': 3}, {})],
+        )
+        with self.assertRaises(ValueError):
+            Event.iter_validate(sources(), chunk_size=0)
+
+
+class TestNestedModels(unittest.TestCase):
+
+    def define_order(self, **options):
+
+        class Volume(Attribute):
+            @classmethod
+            def transform(klass, input_value):
+                return int(input_value)
+            @classmethod
+            def validate(klass, input_value):
+                if input_value > 0:
+                    return True, input_value
+                else:
+                    return False, 'not positive'
+
+        class Address(Froshki):
+            city = Attribute()
+            zip_code = Attribute(key_alias='zip')
+
+        class OrderItem(CompactFroshki):
+            item_id = Attribute()
+            volume = Volume()
+            @validation_hook.extend(error='too many')
+            def limit_volume(self):
+                try:
+                    return self.volume < 100
+                except TypeError:
+                    return False
+
+        class Order(Froshki):
+            address = ModelAttribute(Address, **options)
+            items = ListOf(OrderItem, **options)
+            note = ModelAttribute(Address, nullable=True)
+
+        return Order
+
+    def test_nested_validation(self):
+
+        Order = self.define_order()
+        order = Order(
+            address={'city': 'Tokyo', 'zip': '100-0001'},
+            items=[{'item_id': 1, 'volume': '2'}, {'item_id': 2, 'volume': 3}],
+        )
+        self.assertTrue(order.validate())
+        self.assertEqual(
+            order.address, {'city': 'Tokyo', 'zip_code': '100-0001'},
+        )
+        self.assertEqual(
+            order.items,
+            [{'item_id': 1, 'volume': 2}, {'item_id': 2, 'volume': 3}],
+        )
+        self.assertIsNone(order.note)
+
+        order.address = {'city': 'Tokyo', 'country': 'Japan'}
+        order.items = [
+            {'item_id': 1, 'volume': 'x'}, {'item_id': 2, 'volume': 1},
+            {'item_id': 3, 'volume': 200}, 'item',
+        ]
+        order.note = []
+        self.assertFalse(order.validate())
+        self.assertEqual(
+            order.errors,
+            {
+                'address': {'country': 'unknown attribute'},
+                'items': {
+                    0: {
+                        'volume': 'data conversion error: x',
+                        'limit_volume': 'too many',
+                    },
+                    2: {'limit_volume': 'too many'},
+                    3: 'data conversion error: item',
+                },
+                'note': 'data conversion error: []',
+            },
+        )
+
+        records, errors = Order.validate_many([
+            dict(address={'city': 'Osaka'}, items=[]),
+            dict(address={'city': 'Kyoto'}, items={'item_id': 1}),
+        ])
+        self.assertEqual(
+            records,
+            [dict(
+                address={'city': 'Osaka', 'zip_code': None},
+                items=[], note=None,
+            )],
+        )
+        self.assertEqual(list(errors), [1])
+
+    def test_nested_models(self):
+
+        Order = self.define_order(as_model=True)
+        order = Order(
+            address={'city': 'Tokyo'},
+            items=[{'item_id': 1, 'volume': '2'}],
+        )
+        self.assertTrue(order.validate())
+        self.assertEqual(order.address.city, 'Tokyo')
+        self.assertEqual(order.items[0].volume, 2)
+        self.assertTrue(order.items[0].validate())
+        self.assertEqual(
+            json.loads(order.dumps()),
+            {'address': {'city': 'Tokyo', 'zip_code': None},
+             'items': [{'item_id': 1, 'volume': 2}], 'note': None},
+        )
@@ -0,0 +1,62 @@
+# encoding: utf-8
+
+import unittest
+from concurrent import futures
+from froshki import Froshki, Attribute, validation_hook
+from froshki.parallel import ModelReference, validate_parallel
+
+
+class ResourceId(Attribute):
+    @classmethod
+    def transform(klass, input_value):
+        return int(input_value)
+    @classmethod
+    def validate(klass, input_value):
+        if input_value in (1,5,7,9):
+            return True, input_value
+        else:
+            return False, 'resource id not found'
+
+
+class Download(Froshki):
+    resource_id = ResourceId()
+    filetype = Attribute()
+    @validation_hook.extend(error='pdf only')
+    def pdf_only(self):
+        return self.filetype == 'pdf'
+
+
+class TestParallelValidation(unittest.TestCase):
+
+    def test_validate_parallel(self):
+
+        sources = [
+            {'resource_id': str(resource_id), 'filetype': filetype}
+            for resource_id in range(10)
+            for filetype in ('pdf', 'txt')
+        ]
+        expected = Download.validate_many(sources)
+        with futures.ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                validate_parallel(
+                    Download, iter(sources), chunk_size=3, executor=executor,
+                ),
+                expected,
+            )
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                validate_parallel(
+                    Download, sources, chunk_size=7, executor=executor,
+                ),
+                expected,
+            )
+
+    def test_model_reference(self):
+
+        self.assertIs(ModelReference(Download).resolve(), Download)
+
+        class LocalDownload(Froshki):
+            filetype = Attribute()
+
+        with self.assertRaises(TypeError):
+            validate_parallel(LocalDownload, [{'filetype': 'pdf'}])